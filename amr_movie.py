@@ -27,17 +27,18 @@
 # convert -delay 30 '*.png' movie.mov
 # Or ImageJ File, Import, Image Sequence, File, SaveAs, AVI
 #
-import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 
+from profiling import phase, enable_from_argv
+from preview import read_preview, select_lod, figure_width, lod_points
+
 def read_amr(filenames):
   x = []
   phi = []
 
   for filename in filenames:
-    with open(filename, "r") as f:
+    with phase("file_load"), open(filename, "r") as f:
       for line in f:
         data = line.split()
         x.append(float(data[0]))
@@ -45,21 +46,38 @@ def read_amr(filenames):
 
   return x,phi
 
+def frame_points(filenames, width):
+  # mean of the coarsest preview with a bin per pixel, every cell when there is none
+  lod = read_preview(filenames)
+  bins = select_lod(lod, width) if lod else None
+  if bins:
+    x, low, high, phi = lod_points(lod, bins)
+    return x, phi
+  return read_amr(filenames)
+
 def save_fig(x, phi, time):
+  import matplotlib.pyplot as plt
 
-  fig, ax = plt.subplots()
-  ax.plot(x, phi, '.', markersize=4)
-  plt.ylim([-0.1,1.1])
-  plt.savefig(time+'.png')
+  with phase("plot"):
+    fig, ax = plt.subplots()
+    ax.plot(x, phi, '.', markersize=4)
+    plt.ylim([-0.1,1.1])
+    plt.savefig(time+'.png')
+    plt.close(fig)
 
 if __name__== "__main__":
+  enable_from_argv()
+  # frames only go to png files, so no display backend is needed
+  import matplotlib
+  matplotlib.use("Agg")
 
   font = {'weight' : 'bold',
           'size' : 18}
 
   matplotlib.rc('font',**font)
 
-  files = os.listdir("./")
+  files = [file for file in os.listdir("./") if not file.endswith(".preview")]
+  width = figure_width()
 
   old_count = ''
   amr_files = []
@@ -71,7 +89,7 @@ if __name__== "__main__":
       print(entries)
       if entries[0] != old_count:
         if len(amr_files) > 0:
-          x, phi = read_amr(amr_files)
+          x, phi = frame_points(amr_files, width)
           save_fig(x, phi, entries[0])
         old_count = entries[0]
         amr_files = []
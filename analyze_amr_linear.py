@@ -25,29 +25,41 @@
 import numpy as np
 import argparse
 
-def read_amr(filenames):
+from analyze_linear import PRECISIONS
+from profiling import phase, enable_from_argv, start_phase, stop_phase
+from preview import read_preview, select_lod, figure_width, lod_points
+
+def read_amr(filenames, dtype=np.float64):
   x = []
   phi = []
 
   for filename in filenames:
-    with open(filename, "r") as f:
+    with phase("file_load"), open(filename, "r") as f:
       for line in f:
         data = line.split()
         x.append(float(data[0]))
-        phi.append(float(data[1]))
+        phi.append(dtype(data[1]))
 
   return x,phi
   
 if __name__== "__main__":
+  enable_from_argv()
+  start_phase("plot")
   import matplotlib
   import matplotlib.pyplot as plt
 
   parser = argparse.ArgumentParser(description='Plot convergence for fixed grid linear advection.')
   parser.add_argument('text_files',nargs='*')
+  parser.add_argument('--precision',choices=PRECISIONS.keys(),default='double',
+                      help='PRECISION the output files were written with')
+  parser.add_argument('--width',type=int,help='figure width in pixels, default from matplotlib')
+  parser.add_argument('--full',action='store_true',help='plot every cell even with a preview')
 
   args = parser.parse_args()
 
-  x, phi = read_amr(args.text_files)
+  # the coarsest preview with a bin per pixel, the full output only when none is fine enough
+  lod = None if args.full else read_preview(args.text_files)
+  bins = select_lod(lod, args.width or figure_width()) if lod else None
 
   plt.figure()
   plt.ylabel("phi")
@@ -55,7 +67,14 @@ if __name__== "__main__":
   plt.title("AMR Lax-Friedrichs linear advection")
   plt.ylim([-0.1,1.1])
   plt.xlim([-0.1,1.1])
-  plt.plot(x, phi, '.', label='numeric')
+  if bins:
+    x, low, high, phi = lod_points(lod, bins)
+    plt.fill_between(x, low, high, alpha=0.3, label='min/max of %d bins' % bins)
+    plt.plot(x, phi, '.', label='numeric')
+  else:
+    x, phi = read_amr(args.text_files, PRECISIONS[args.precision])
+    plt.plot(x, phi, '.', label='numeric')
   plt.legend(loc='best')
+  stop_phase()
   plt.show()
 
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# reads the per step diagnostics.<NX>.txt table diagnostics.rg writes: dx weighted totals,
+# min, max and NaN count of every conserved field over the active cells of all levels
+#
+import numpy as np
+import argparse
+import sys
+from profiling import enable_from_argv
+
+def read_diagnostics(filename):
+  # columns by name from the "# step time phi_total phi_min phi_max phi_nans" header
+  with open(filename, "r") as f:
+    names = f.readline().lstrip("#").split()
+    rows = [line.split() for line in f if line.strip() and not line.startswith("#")]
+  # a run killed mid write leaves a short last row
+  rows = [row for row in rows if len(row) == len(names)]
+  data = np.array(rows, dtype=float).reshape(-1, len(names))
+  return {name: data[:, i] for i, name in enumerate(names)}
+
+def conserved_fields(columns):
+  return [name[:-len("_total")] for name in columns if name.endswith("_total")]
+
+def drift(columns, field):
+  # change of the total relative to the first row
+  total = columns[field + "_total"]
+  scale = max(abs(total[0]), np.finfo(float).tiny)
+  return (total - total[0]) / scale
+
+def first_bad_step(columns):
+  # first step with a NaN cell or a non-finite total, None for a healthy run
+  bad = np.zeros(len(columns["step"]), dtype=bool)
+  for field in conserved_fields(columns):
+    bad |= columns[field + "_nans"] > 0
+    bad |= ~np.isfinite(columns[field + "_total"])
+  if not bad.any():
+    return None
+  return int(columns["step"][np.argmax(bad)])
+
+def print_summary(columns):
+  print("%d rows, steps %d to %d, time %g to %g" % (len(columns["step"]), columns["step"][0],
+        columns["step"][-1], columns["time"][0], columns["time"][-1]))
+  print("%-10s %-14s %-14s %-12s %-12s %-12s %s" % ("field", "first total", "last total",
+        "max drift", "min", "max", "NaNs"))
+  for field in conserved_fields(columns):
+    total = columns[field + "_total"]
+    print("%-10s %-14.8g %-14.8g %-12.4g %-12.6g %-12.6g %d" % (field, total[0], total[-1],
+          np.max(np.abs(drift(columns, field))), np.min(columns[field + "_min"]),
+          np.max(columns[field + "_max"]), columns[field + "_nans"][-1]))
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Summarize the per step conservation and norm diagnostics.')
+  parser.add_argument('diagnostics_file',help='diagnostics.<NX>.txt written by 1d_fix.rg or 1d_amr.rg')
+  parser.add_argument('--tolerance',type=float,
+                      help='fail when a total drifts more than this relative to the first row')
+  args = parser.parse_args()
+
+  columns = read_diagnostics(args.diagnostics_file)
+  print_summary(columns)
+  ERROR = 0
+  step = first_bad_step(columns)
+  if step is not None:
+    print("first NaN or non-finite total at step %d" % step)
+    ERROR = 1
+  if args.tolerance is not None:
+    for field in conserved_fields(columns):
+      if np.max(np.abs(drift(columns, field))) > args.tolerance:
+        print("%s total drifted more than %g" % (field, args.tolerance))
+        ERROR = 1
+  sys.exit(ERROR)
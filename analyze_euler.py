@@ -24,10 +24,15 @@
 # clearly marked, so as not to confuse it with the version available from LANL.
 import numpy as np
 import argparse
+import contextlib
+import multiprocessing
 
-from euler import GAMMA, BETA, x, x_jump, P_l, rho_l, u_l, P_r, rho_r, u_r
+from euler import GAMMA, BETA, x_jump, P_l, rho_l, u_l, P_r, rho_r, u_r
 from riemann import one, three, EPS, deriv_phi, rho_star, verify_Rankine_Hugoniot
 from riemann import speed_of_sound
+from analyze_linear import PRECISIONS
+from profiling import phase, enable_from_argv, start_phase, stop_phase
+from shards import read_cells, needs_pool
 
 t_final = 0.142625
 
@@ -92,41 +97,41 @@ def reimann_solve(x):
       sie[i] = specific_internal_energy(pressure[i], density[i])
     return density, velocity, pressure, sie
 
-def measure_error(filename):
-    with open(filename,"r") as f:
-      density = []
-      momentum = []
-      energy = []
-      for line in f:
-        data = line.split()
-        density.append(float(data[0]))
-        momentum.append(float(data[1]))
-        energy.append(float(data[2]))
-      x = (0.5 + np.arange(float(len(density))) )/float(len(density))
-
-      momentum = np.array(momentum)
-      num_density = np.array(density)
-      energy = np.array(energy)
-      num_velocity = momentum / num_density
-      num_pressure = get_pressure(energy, num_density, num_velocity)
-      num_sie = specific_internal_energy(num_pressure, num_density)
+def measure_state_error(num_density, momentum, energy):
+    x = (0.5 + np.arange(float(len(num_density))) )/float(len(num_density))
 
+    # derived quantities in double whatever the storage precision
+    num_velocity = momentum.astype(np.float64) / num_density
+    num_pressure = get_pressure(energy.astype(np.float64), num_density, num_velocity)
+    num_sie = specific_internal_energy(num_pressure, num_density)
+
+    with phase("analytic"):
       density, velocity, pressure, sie = reimann_solve(x)
 
-      sie_L2 = np.mean((num_sie - sie)**2)
-      P_L2 = np.mean((num_pressure - pressure)**2)
-      v_L2 = np.mean((num_velocity - velocity)**2)
-      rho_L2 = np.mean((num_density - density)**2)
-      L2 = np.mean([sie_L2, P_L2, v_L2, rho_L2])
+    sie_L2 = np.mean((num_sie - sie)**2)
+    P_L2 = np.mean((num_pressure - pressure)**2)
+    v_L2 = np.mean((num_velocity - velocity)**2)
+    rho_L2 = np.mean((num_density - density)**2)
+    L2 = np.mean([sie_L2, P_L2, v_L2, rho_L2])
 
     return L2, x, num_density, density
 
+def measure_error(filename, dtype=np.float64, pool=None):
+    with phase("file_load"):
+      cells = read_cells(filename, pool).astype(dtype)
+
+    return measure_state_error(cells[:, 0], cells[:, 1], cells[:, 2])
+
 if __name__== "__main__":
+  enable_from_argv()
+  start_phase("plot")
   import matplotlib
   import matplotlib.pyplot as plt
 
   parser = argparse.ArgumentParser(description='Plot convergence for fixed grid linear advection.')
   parser.add_argument('text_files',nargs='*')
+  parser.add_argument('--precision',choices=PRECISIONS.keys(),default='double',
+                      help='PRECISION the output files were written with')
 
   args = parser.parse_args()
   NX = []
@@ -142,13 +147,15 @@ if __name__== "__main__":
   density, velocity, pressure, sie = reimann_solve(x)
   plt.plot(x,density,label='anal')
 
-  for filename in args.text_files:
-    print(filename)
-    resolution = filename.split('.')
-    NX.append(float(resolution[1]))
-    L2, x, num_density, density = measure_error(filename)
-    plt.plot(x,num_density,'--',label='NX='+str(NX[-1]))
-    Error.append(L2)
+  # a pool only pays for its start up when some output has large shards
+  with multiprocessing.Pool() if needs_pool(args.text_files) else contextlib.nullcontext() as pool:
+    for filename in args.text_files:
+      print(filename)
+      resolution = filename.split('.')
+      NX.append(float(resolution[1]))
+      L2, x, num_density, density = measure_error(filename, PRECISIONS[args.precision], pool)
+      plt.plot(x,num_density,'--',label='NX='+str(NX[-1]))
+      Error.append(L2)
 
   print(NX)
   print(Error)
@@ -167,5 +174,6 @@ if __name__== "__main__":
   #A = np.exp(fit[1])
   #plt.plot(NX, A * NX**p,label="NX^"+str(p))
   plt.legend(loc='best')
+  stop_phase()
   plt.show()
 
@@ -24,31 +24,45 @@
 # clearly marked, so as not to confuse it with the version available from LANL.
 import numpy as np
 import argparse
+import contextlib
+import multiprocessing
+
+from profiling import phase, enable_from_argv, start_phase, stop_phase
+from shards import read_cells, needs_pool
+
+# numpy dtype matching the PRECISION the model fields were stored with
+PRECISIONS = {"double": np.float64, "single": np.float32}
 
 def trapezoid(x,f):
   value = np.sum(0.5 * (x[1:] - x[0:-1]) * (f[0:-1] + f[1:]))
   value += x[0] * f[0] + (1-x[-1])*f[-1]
   return value
 
-def measure_error(filename):
-  with open(filename,"r") as f:
-    numeric = []
-    for line in f:
-      numeric.append(float(line))
+def measure_state_error(numeric):
+  with phase("analytic"):
     x = np.arange(float(len(numeric)))/float(len(numeric))
     x += 0.5 * x[1]
     analytic = np.zeros(len(numeric))
     analytic[np.where(x<0.75)] = 1.0
 
-    L2 = trapezoid(x,(numeric-analytic)**2)
+    L2 = trapezoid(x,(numeric.astype(np.float64)-analytic)**2)
   return L2, x, numeric, analytic
 
+def measure_error(filename, dtype=np.float64, pool=None):
+  with phase("file_load"):
+    numeric = read_cells(filename, pool)[:, 0].astype(dtype)
+  return measure_state_error(numeric)
+
 if __name__== "__main__":
+  enable_from_argv()
+  start_phase("plot")
   import matplotlib
   import matplotlib.pyplot as plt
 
   parser = argparse.ArgumentParser(description='Plot convergence for fixed grid linear advection.')
   parser.add_argument('text_files',nargs='*')
+  parser.add_argument('--precision',choices=PRECISIONS.keys(),default='double',
+                      help='PRECISION the output files were written with')
 
   args = parser.parse_args()
   NX = []
@@ -63,13 +77,15 @@ if __name__== "__main__":
   analytic[np.where(x<0.75)] = 1.0
   plt.plot(x,analytic,label='analytic')
 
-  for filename in args.text_files:
-    print(filename)
-    resolution = filename.split('.')
-    NX.append(float(resolution[1]))
-    L2, x, numeric, analytic = measure_error(filename)
-    Error.append(L2)
-    plt.plot(x,numeric,'--',label='NX='+str(NX[-1]))
+  # a pool only pays for its start up when some output has large shards
+  with multiprocessing.Pool() if needs_pool(args.text_files) else contextlib.nullcontext() as pool:
+    for filename in args.text_files:
+      print(filename)
+      resolution = filename.split('.')
+      NX.append(float(resolution[1]))
+      L2, x, numeric, analytic = measure_error(filename, PRECISIONS[args.precision], pool)
+      Error.append(L2)
+      plt.plot(x,numeric,'--',label='NX='+str(NX[-1]))
 
 
   DX = 1.0 / np.array(NX)
@@ -100,5 +116,6 @@ if __name__== "__main__":
           'size' : 18}
 
   matplotlib.rc('font',**font)
+  stop_phase()
   plt.show()
 
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# pick NUM_PARTITIONS, CELLS_PER_BLOCK_X and -ll:cpu for a problem on this machine: every
+# configuration of the grid runs a short and a long calibration, the difference gives the time
+# per step without compile and startup, and the fastest is cached per machine and problem.
+# CELLS_PER_BLOCK_X decides where AMR refines, so only fixed grid drivers tune the block size
+#
+import argparse
+import json
+import os
+import platform
+import re
+import shlex
+import subprocess
+import sys
+import time
+
+from plan_resolution import MODELS, read_global_const, write_global_const, update_global_const
+from profiling import enable_from_argv
+
+legion_root = os.environ.get('LEGION_ROOT', '../../github/legion')
+DEFAULT_COMMAND = os.path.join(legion_root, 'language/regent.py') + " {driver} -ll:cpu {cpus}"
+
+CALIBRATION_STEPS = (5, 25)
+CACHE = ".autotune.json"
+FIXED_GRID_DRIVERS = ["1d_fix.rg"]
+
+def machine_signature():
+  return "%s %s %d cpus" % (platform.node(), platform.machine(), os.cpu_count())
+
+def tunes_block_size(driver):
+  # on an AMR grid the block layout changes the refinement and so the answer
+  return os.path.basename(driver) in FIXED_GRID_DRIVERS
+
+def problem_signature(driver, model, constants):
+  nx = (constants["CELLS_PER_BLOCK_X"] * constants["LEVEL_1_BLOCKS_X"]
+        * 2**(constants["MAX_REFINEMENT_LEVEL"] - 1))
+  signature = "%s %s NX=%d levels=%d %s" % (driver, model, nx, constants["MAX_REFINEMENT_LEVEL"],
+                                            constants.get("PRECISION", "double"))
+  if not tunes_block_size(driver):
+    signature += " CELLS_PER_BLOCK_X=%d LEVEL_1_BLOCKS_X=%d" % (constants["CELLS_PER_BLOCK_X"],
+                                                                constants["LEVEL_1_BLOCKS_X"])
+  return signature
+
+def block_size_choices(driver, constants, cells_per_block):
+  # the CELLS_PER_BLOCK_X choices of a driver, the one of constants unless it is a fixed grid
+  if tunes_block_size(driver):
+    return cells_per_block
+  return [constants["CELLS_PER_BLOCK_X"]]
+
+def default_choices(maximum):
+  # powers of two up to maximum, plus maximum itself
+  choices = []
+  value = 1
+  while value < maximum:
+    choices.append(value)
+    value *= 2
+  return choices + [maximum]
+
+def candidates(constants, partitions, cells_per_block, cpus):
+  # configurations with the finest NX of constants, CELLS_PER_BLOCK_X even and dividing it
+  nx = (constants["CELLS_PER_BLOCK_X"] * constants["LEVEL_1_BLOCKS_X"]
+        * 2**(constants["MAX_REFINEMENT_LEVEL"] - 1))
+  level_1_cells = nx // 2**(constants["MAX_REFINEMENT_LEVEL"] - 1)
+  configs = []
+  for cells in cells_per_block:
+    if cells % 2 != 0 or level_1_cells % cells != 0:
+      continue
+    for num_partitions in partitions:
+      # every color needs a level 1 block
+      if num_partitions > level_1_cells // cells:
+        continue
+      for cpu in cpus:
+        configs.append({"CELLS_PER_BLOCK_X": cells, "LEVEL_1_BLOCKS_X": level_1_cells // cells,
+                        "NUM_PARTITIONS": num_partitions, "cpus": cpu})
+  return configs
+
+def t_final_for_steps(steps, dt):
+  # the time loop "while time < T_FINAL - DT" takes exactly steps steps
+  return (steps + 0.5) * dt
+
+def run_config(command, driver, constants, config, steps, dt, global_const="global_const.rg"):
+  # seconds of one run, as reported by an "autotune_seconds <s>" line or else the wall clock,
+  # the command runs in the directory of global_const; None if the command fails
+  run_constants = dict(constants)
+  run_constants.update({name: config[name] for name in ["CELLS_PER_BLOCK_X", "LEVEL_1_BLOCKS_X",
+                                                        "NUM_PARTITIONS"]})
+  run_constants["T_FINAL"] = t_final_for_steps(steps, dt)
+  with open(global_const, "w") as f:
+    write_global_const(f, run_constants)
+  start = time.time()
+  try:
+    output = subprocess.run(shlex.split(solver_command(command, driver, config["cpus"])),
+                            cwd=os.path.dirname(os.path.abspath(global_const)),
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+                            universal_newlines=True).stdout
+  except subprocess.CalledProcessError:
+    return None
+  seconds = time.time() - start
+  match = re.search(r"^autotune_seconds\s+(\S+)", output, re.MULTILINE)
+  if match:
+    seconds = float(match.group(1))
+  return seconds
+
+def calibrate(command, driver, model, constants, configs, global_const="global_const.rg",
+              calibration_steps=CALIBRATION_STEPS):
+  # seconds per step of every configuration, None for one whose runs failed, global_const.rg is
+  # restored afterwards
+  dt = MODELS[model]["dt"]
+  short, long = calibration_steps
+  with open(global_const, "r") as f:
+    original = f.read()
+  results = []
+  try:
+    for config in configs:
+      short_seconds = run_config(command, driver, constants, config, short, dt, global_const)
+      long_seconds = None
+      if short_seconds is not None:
+        long_seconds = run_config(command, driver, constants, config, long, dt, global_const)
+      if long_seconds is None:
+        results.append((None, config))
+      else:
+        results.append((max(long_seconds - short_seconds, 0.0) / (long - short), config))
+  finally:
+    with open(global_const, "w") as f:
+      f.write(original)
+  return results
+
+def read_cache(filename):
+  if not os.path.exists(filename):
+    return {}
+  with open(filename, "r") as f:
+    return json.load(f)
+
+def write_cache(filename, cache):
+  with open(filename, "w") as f:
+    json.dump(cache, f, indent=1, sort_keys=True)
+
+def cache_key(command, driver, model, constants):
+  # timings only carry over to the same machine, solver command and problem
+  return " | ".join([machine_signature(), command, problem_signature(driver, model, constants)])
+
+def tune(command, driver, model, constants, configs, cache_file=CACHE, retune=False,
+         global_const="global_const.rg", calibration_steps=CALIBRATION_STEPS):
+  # the cached choice for this machine, command and problem, or the fastest calibrated
+  # configuration; None with the results when every configuration failed
+  key = cache_key(command, driver, model, constants)
+  cache = read_cache(cache_file)
+  if key in cache and not retune:
+    return cache[key], None
+  results = calibrate(command, driver, model, constants, configs, global_const, calibration_steps)
+  timed = [result for result in results if result[0] is not None]
+  if not timed:
+    return None, results
+  seconds, best = min(timed, key=lambda result: result[0])
+  cache[key] = dict(best, seconds_per_step=seconds)
+  write_cache(cache_file, cache)
+  return cache[key], results
+
+def int_list(text):
+  return [int(entry) for entry in text.split(",")]
+
+def solver_command(command, driver, cpus):
+  return command.format(driver=driver, cpus=cpus)
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Fastest NUM_PARTITIONS, CELLS_PER_BLOCK_X and -ll:cpu for a problem on this machine.')
+  parser.add_argument('--driver',default='1d_fix.rg')
+  parser.add_argument('--model',choices=MODELS.keys(),default='linear',
+                      help='model linked as model.rg, sets DT of the calibration runs')
+  parser.add_argument('--global-const',default='global_const.rg',help='the problem to tune')
+  parser.add_argument('--command',default=DEFAULT_COMMAND,
+                      help='solver command with {driver} and {cpus} fields')
+  parser.add_argument('--partitions',type=int_list,help='comma separated NUM_PARTITIONS choices')
+  parser.add_argument('--cells-per-block',type=int_list,
+                      help='comma separated CELLS_PER_BLOCK_X choices, fixed grid drivers only')
+  parser.add_argument('--cpus',type=int_list,help='comma separated -ll:cpu choices')
+  parser.add_argument('--cache',default=CACHE)
+  parser.add_argument('--retune',action='store_true',help='ignore the cached choice')
+  parser.add_argument('--apply',action='store_true',help='write the choice into --global-const')
+  args = parser.parse_args()
+
+  constants = read_global_const(args.global_const)
+  cpu_count = os.cpu_count()
+  if args.cells_per_block and not tunes_block_size(args.driver):
+    print("%s refines by block, keeping CELLS_PER_BLOCK_X = %d" % (args.driver,
+                                                                  constants["CELLS_PER_BLOCK_X"]))
+  configs = candidates(constants, args.partitions or default_choices(2 * cpu_count),
+                       block_size_choices(args.driver, constants,
+                                          args.cells_per_block or [2, 4, 8, 16, 32, 64]),
+                       args.cpus or default_choices(cpu_count))
+  if not configs:
+    print("no configuration keeps NX with these choices")
+    sys.exit(1)
+
+  best, results = tune(args.command, args.driver, args.model, constants, configs, args.cache,
+                       args.retune, args.global_const)
+  if results is None:
+    print("cached for this machine and problem")
+  else:
+    print("%-18s %-17s %-15s %-5s %s" % ("CELLS_PER_BLOCK_X", "LEVEL_1_BLOCKS_X", "NUM_PARTITIONS",
+                                         "cpus", "seconds/step"))
+    # failed configurations last
+    for seconds, config in sorted(results, key=lambda result: (result[0] is None, result[0] or 0.0)):
+      print("%-18d %-17d %-15d %-5d %s" % (config["CELLS_PER_BLOCK_X"],
+            config["LEVEL_1_BLOCKS_X"], config["NUM_PARTITIONS"], config["cpus"],
+            "failed" if seconds is None else "%.4g" % seconds))
+  if best is None:
+    print("every configuration failed")
+    sys.exit(1)
+  print("best: CELLS_PER_BLOCK_X = %d LEVEL_1_BLOCKS_X = %d NUM_PARTITIONS = %d -ll:cpu %d "
+        "(%.4g s/step)" % (best["CELLS_PER_BLOCK_X"], best["LEVEL_1_BLOCKS_X"],
+                           best["NUM_PARTITIONS"], best["cpus"], best["seconds_per_step"]))
+  # -ll:cpu is not part of global_const.rg, the command line carries it
+  print("run: " + solver_command(args.command, args.driver, best["cpus"]))
+  if args.apply:
+    update_global_const(args.global_const, {name: best[name] for name in
+                                            ["CELLS_PER_BLOCK_X", "LEVEL_1_BLOCKS_X",
+                                             "NUM_PARTITIONS"]})
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# headless report of a whole sweep in one process: L2 error tables, convergence orders,
+# diagnostics summaries and, unless --no-plot, solution and convergence plots written with the
+# Agg backend.  matplotlib and the model analysis modules are only imported when needed
+#
+import numpy as np
+import argparse
+import os
+import sys
+
+from watch_analysis import model_of, current_run
+from plan_resolution import fit_order
+from analyze_linear import PRECISIONS
+from shards import group_shards
+from profiling import phase, enable_from_argv
+
+def find_outputs(directory):
+  # output files by model, the shards of a fixed grid output as one file, plus the diagnostics
+  # tables
+  outputs = {"linear": [], "euler": [], "linear_amr": [], "diagnostics": []}
+  for filename in group_shards(sorted(os.listdir(directory))):
+    model = model_of(filename)
+    if model is not None:
+      outputs[model].append(filename)
+    elif filename.startswith("diagnostics.") and filename.endswith(".txt"):
+      outputs["diagnostics"].append(filename)
+  return outputs
+
+def analyze_fixed_files(directory, model, filenames, dtype):
+  # rows of (NX, L2, filename, x, numeric, analytic) sorted by NX
+  if model == "linear":
+    from analyze_linear import measure_error
+  else:
+    from analyze_euler import measure_error
+  rows = []
+  for filename in filenames:
+    L2, x, numeric, analytic = measure_error(os.path.join(directory, filename), dtype)
+    rows.append((float(filename.split('.')[1]), L2, filename, x, numeric, analytic))
+  return sorted(rows, key=lambda row: row[0])
+
+def analyze_amr_files(directory, filenames, dtype):
+  # the linear_amr files of the newest run, older ones are left over from earlier runs
+  from analyze_linear import trapezoid
+  from analyze_amr_linear import read_amr
+  filenames = current_run({filename: os.stat(os.path.join(directory, filename)).st_mtime_ns
+                           for filename in filenames})
+  x, phi = read_amr([os.path.join(directory, filename) for filename in filenames], dtype)
+  x = np.array(x)
+  phi = np.array(phi, dtype=np.float64)
+  order = np.argsort(x)
+  x = x[order]
+  phi = phi[order]
+  analytic = np.zeros(len(x))
+  analytic[np.where(x < 0.75)] = 1.0
+  NX = max([float(filename.split('.')[1]) for filename in filenames])
+  return (NX, trapezoid(x, (phi - analytic)**2), "linear_amr.*.*.txt", x, phi, analytic)
+
+def write_table(filename, rows):
+  with open(filename, "w") as f:
+    f.write("# NX L2 file\n")
+    for row in rows:
+      f.write("%d %.17g %s\n" % row[:3])
+
+def pyplot():
+  import matplotlib
+  matplotlib.use("Agg")
+  import matplotlib.pyplot as plt
+  return plt
+
+def plot_solutions(output, model, rows):
+  plt = pyplot()
+  fig = plt.figure()
+  plt.title(model)
+  plt.ylabel("density" if model == "euler" else "phi")
+  plt.xlabel("x")
+  finest = rows[-1]
+  plt.plot(finest[3], finest[5], label='analytic')
+  for NX, L2, filename, x, numeric, analytic in rows:
+    plt.plot(x, numeric, '--', label='NX=' + str(int(NX)))
+  plt.legend(loc='best')
+  plt.savefig(os.path.join(output, "solution_" + model + ".png"))
+  plt.close(fig)
+
+def plot_convergence(output, model, NX, L2, fit):
+  plt = pyplot()
+  fig = plt.figure()
+  plt.title(model + " convergence")
+  plt.ylabel("L_2 error")
+  plt.xlabel("NX")
+  plt.yscale('log')
+  plt.xscale('log')
+  plt.plot(NX, L2, 'o')
+  if fit is not None:
+    p, A = fit
+    NX = np.array(NX)
+    plt.plot(NX, A * NX**-p, label="NX^-" + "%3.2f" % p)
+    plt.legend(loc='best')
+  plt.savefig(os.path.join(output, "convergence_" + model + ".png"))
+  plt.close(fig)
+
+def report(directory, output, plot=True, dtype=np.float64):
+  # writes errors_<model>.dat, report.txt and the plots to output, returns the report lines
+  os.makedirs(output, exist_ok=True)
+  outputs = find_outputs(directory)
+  lines = []
+  for model in ["linear", "euler", "linear_amr"]:
+    if not outputs[model]:
+      continue
+    if model == "linear_amr":
+      rows = [analyze_amr_files(directory, outputs[model], dtype)]
+    else:
+      rows = analyze_fixed_files(directory, model, outputs[model], dtype)
+    write_table(os.path.join(output, "errors_" + model + ".dat"), rows)
+    NX = [row[0] for row in rows]
+    L2 = [row[1] for row in rows]
+    lines.append("%s" % model)
+    lines += ["  NX=%-8d L2=%.6g  %s" % row[:3] for row in rows]
+    fit = None
+    if len(set(NX)) > 1:
+      fit = fit_order(NX, L2)
+      lines.append("  order %.3f from %d resolutions" % (fit[0], len(NX)))
+    if plot:
+      with phase("plot"):
+        plot_solutions(output, model, rows)
+        plot_convergence(output, model, NX, L2, fit)
+  if outputs["diagnostics"]:
+    from analyze_diagnostics import read_diagnostics, conserved_fields, drift, first_bad_step
+    lines.append("diagnostics")
+    for filename in outputs["diagnostics"]:
+      columns = read_diagnostics(os.path.join(directory, filename))
+      drifts = ["%s drift %.3g" % (field, np.max(np.abs(drift(columns, field))))
+                for field in conserved_fields(columns)]
+      step = first_bad_step(columns)
+      health = "healthy" if step is None else "NaN at step %d" % step
+      lines.append("  %s %d rows %s %s" % (filename, len(columns["step"]), " ".join(drifts), health))
+  with open(os.path.join(output, "report.txt"), "w") as f:
+    f.write("\n".join(lines) + "\n")
+  return lines
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Headless error tables and plots for a whole sweep.')
+  parser.add_argument('directory',nargs='?',default='.')
+  parser.add_argument('-o','--output',help='report directory, default <directory>/report')
+  parser.add_argument('--no-plot',action='store_true',help='only write the tables')
+  parser.add_argument('--precision',choices=PRECISIONS.keys(),default='double',
+                      help='PRECISION the output files were written with')
+  args = parser.parse_args()
+
+  output = args.output or os.path.join(args.directory, "report")
+  lines = report(args.directory, output, not args.no_plot, PRECISIONS[args.precision])
+  if not lines:
+    print("no output files in " + args.directory)
+    sys.exit(1)
+  print("\n".join(lines))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import numpy as np
+import argparse
+import time
+
+from euler import initial_state, advance, FLUXES
+from analyze_euler import measure_state_error
+from profiling import enable_from_argv
+
+# same Sod problem and time loop as test_euler.py
+DT = 0.2 / 3200  # euler.rg
+T_FINAL = 0.142681382
+# L2 thresholds test_euler.py requires of Lax-Friedrichs at NX=400 and NX=800
+THRESHOLDS = [0.0353730, 0.0126879]
+# resolutions 1d_fix.rg runs with CELLS_PER_BLOCK_X = 5, LEVEL_1_BLOCKS_X = 5
+RESOLUTIONS = [25 * 2**n for n in range(7)]
+
+def solve(nx, flux, muscl):
+  dx = 1.0 / nx
+  U = initial_state(nx)
+  t = 0.0
+  while t < T_FINAL - DT:
+    U = advance(U, dx, DT, flux, muscl)
+    t += DT
+  return U
+
+def benchmark(flux, muscl, resolutions):
+  # smallest resolution, and its run time, meeting each threshold
+  needed = [None] * len(THRESHOLDS)
+  for nx in resolutions:
+    start = time.time()
+    U = solve(nx, flux, muscl)
+    seconds = time.time() - start
+    L2, x, num_density, density = measure_state_error(U[0], U[1], U[2])
+    for i, threshold in enumerate(THRESHOLDS):
+      if needed[i] is None and L2 < threshold:
+        needed[i] = (nx, seconds)
+    if not None in needed:
+      break
+  return needed
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Resolution each Euler flux needs to reach the test_euler.py thresholds.')
+  parser.add_argument('--max-nx',type=int,default=RESOLUTIONS[-1])
+  args = parser.parse_args()
+
+  resolutions = [nx for nx in RESOLUTIONS if nx <= args.max_nx]
+
+  header = "%-16s %-6s" % ("flux", "muscl")
+  for threshold in THRESHOLDS:
+    header += "   NX(L2<%.4g) seconds" % threshold
+  print(header)
+
+  for flux in FLUXES:
+    for muscl in [False, True]:
+      line = "%-16s %-6s" % (flux, muscl)
+      for result in benchmark(flux, muscl, resolutions):
+        if result is None:
+          line += "   %-12s %-7s" % ("> " + str(resolutions[-1]), "-")
+        else:
+          line += "   %-12d %-7.2f" % result
+      print(line)
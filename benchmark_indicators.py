@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# refined cells and L2 error each refinement indicator gives on the step function and Sod problems:
+# the indicator flags blocks of a coarse uniform solution, flagged blocks take the cells of a
+# uniform solution at twice the resolution and the rest keep the coarse cells
+#
+import numpy as np
+import argparse
+
+from parallel_solver import solve
+from refinement_indicators import INDICATORS, flag_blocks
+import analyze_linear
+import analyze_euler
+from profiling import enable_from_argv
+
+PROBLEMS = {"step": ("linear", 0.25), "sod": ("euler", 0.142681382)}
+
+def composite(fine, coarse, refined, cells_per_block):
+  # refined coarse blocks keep their fine children, the rest are coarse cells copied to the children
+  cells = np.repeat(coarse, 2, axis=1)
+  refined_cells = np.repeat(refined, 2 * cells_per_block)
+  cells[:, refined_cells] = fine[:, refined_cells]
+  return cells
+
+def measure(model, cells):
+  if model == "linear":
+    return analyze_linear.measure_state_error(cells[0])[0]
+  return analyze_euler.measure_state_error(cells[0], cells[1], cells[2])[0]
+
+def benchmark(problem, num_blocks, cells_per_block):
+  model, t_final = PROBLEMS[problem]
+  # num_blocks at the coarse level, twice that at the fine level
+  coarse = solve(model, num_blocks, cells_per_block, 1, t_final)
+  fine = solve(model, 2 * num_blocks, cells_per_block, 1, t_final)
+  dx = 1.0 / coarse.shape[1]
+  results = [("all coarse", np.zeros(num_blocks, dtype=bool)),
+             ("all fine", np.ones(num_blocks, dtype=bool))]
+  for indicator in INDICATORS:
+    needs_refinement, wants_coarsening = flag_blocks(indicator, coarse, cells_per_block, dx)
+    results.append((indicator, needs_refinement))
+  rows = []
+  for name, refined in results:
+    refined_cells = 2 * cells_per_block * np.count_nonzero(refined)
+    active_cells = refined_cells + cells_per_block * np.count_nonzero(~refined)
+    L2 = measure(model, composite(fine, coarse, refined, cells_per_block))
+    rows.append((name, refined_cells, active_cells, L2))
+  return rows
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Refined cells and L2 error of each refinement indicator.')
+  parser.add_argument('--cells-per-block-x',type=int,default=4)
+  parser.add_argument('--blocks-x',type=int,default=50,help='blocks at the coarse level')
+  args = parser.parse_args()
+
+  for problem in PROBLEMS:
+    print("%s: coarse NX=%d fine NX=%d" % (problem, args.blocks_x * args.cells_per_block_x,
+                                           2 * args.blocks_x * args.cells_per_block_x))
+    print("%-16s %-14s %-13s %s" % ("indicator", "refined cells", "active cells", "L2"))
+    for name, refined_cells, active_cells, L2 in benchmark(problem, args.blocks_x,
+                                                           args.cells_per_block_x):
+      print("%-16s %-14d %-13d %.6g" % (name, refined_cells, active_cells, L2))
+    print("")
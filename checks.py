@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# PASS/FAIL checks shared by the test drivers, each returns the number of failures to add to
+# ERROR
+#
+import numpy as np
+
+def check(actual, expected, descriptor, rtol=None):
+  # exact unless rtol is given, numpy arrays and lists of numbers are compared elementwise and
+  # with rtol, NaN matches NaN
+  if rtol is not None:
+    passed = np.allclose(actual, expected, rtol=rtol, atol=rtol, equal_nan=True)
+  elif isinstance(actual, np.ndarray) or isinstance(expected, np.ndarray):
+    passed = np.array_equal(actual, expected)
+  else:
+    passed = actual == expected
+  if passed:
+    if isinstance(actual, np.ndarray) or isinstance(expected, np.ndarray):
+      print(descriptor+": \033[0;32mPASS\033[0m")
+    else:
+      print(descriptor+": \033[0;32mPASS\033[0m ",actual," = ",expected)
+    return 0
+  print(descriptor+": \033[0;31mFAIL\033[0m ",actual," != ",expected)
+  return 1
+
+def compare_precision(run, cases):
+  # accuracy versus throughput of each storage PRECISION against the convergence thresholds
+  ERROR = 0
+  print("%-24s %-9s %-14s %-14s %-10s %s" % ("case", "precision", "L2", "threshold", "seconds",
+                                             "speedup"))
+  for refinement_level, filename, threshold, descriptor in cases:
+    double_seconds = 0.0
+    for precision in ["double", "single"]:
+      L2, seconds = run(refinement_level, filename, precision)
+      if precision == "double":
+        double_seconds = seconds
+      if (L2 > threshold) or np.isnan(L2):
+        ERROR = 1
+      print("%-24s %-9s %-14.8g %-14.8g %-10.3f %.2f" % (descriptor, precision, L2, threshold,
+                                                         seconds, double_seconds / seconds))
+  return ERROR
@@ -22,12 +22,13 @@
 # 
 # If software is modified to produce derivative works, such modified software should be
 # clearly marked, so as not to confuse it with the version available from LANL.
-import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
 
 from analyze_linear import trapezoid, measure_error
 from analyze_amr_linear import read_amr
+from profiling import phase, enable_from_argv, start_phase, stop_phase
+
+enable_from_argv()
 
 L2, x, fixed, analytic = measure_error("linear.80.txt")
 
@@ -36,14 +37,19 @@ x_amr, amr = read_amr(filenames)
 print(x_amr)
 x_amr = np.array(x_amr)
 
-amr_analytic = np.zeros(len(amr))
-amr_analytic[np.where(np.array(x_amr)<0.75)] = 1.0
+with phase("analytic"):
+  amr_analytic = np.zeros(len(amr))
+  amr_analytic[np.where(np.array(x_amr)<0.75)] = 1.0
 
-amr_L2 = trapezoid(x_amr, (amr - amr_analytic)**2)
+  amr_L2 = trapezoid(x_amr, (amr - amr_analytic)**2)
  
 print("fixed", L2)
 print("amr", amr_L2)
 
+start_phase("plot")
+import matplotlib
+import matplotlib.pyplot as plt
+
 plt.figure()
 plt.ylabel("phi")
 plt.xlabel("x")
@@ -60,5 +66,6 @@ font = {'family' : 'normal',
         'size' : 18}
 
 matplotlib.rc('font',**font)
+stop_phase()
 plt.show()
 
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# many independent fixed grid problems in one run: the members of a parameter table are stacked
+# along an extra axis of one (num_fields, num_members, NX) state and advanced together, each
+# bitwise identical to a standalone parallel_solver.solve() with its parameters, and the
+# reference for the members 1d_fix.rg runs with ENSEMBLE
+#
+import numpy as np
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+import time
+
+from parallel_solver import (PARAMETERS, FLUXES, OUTPUT_ROWS, initial_condition, time_step,
+                             num_steps, apply_flux, solve)
+from plan_resolution import read_global_const
+from shards import read_cells, needs_pool
+from profiling import phase, enable_from_argv
+
+def read_parameters(filename, model):
+  # one member per row, columns named by the header, e.g. "# P_L RHO_L P_R RHO_R";
+  # parameters without a column keep the model's value
+  members = []
+  names = None
+  with open(filename, "r") as f:
+    for line in f:
+      data = line.lstrip("#").split()
+      if not data:
+        continue
+      if names is None:
+        names = data
+        unknown = set(names) - set(PARAMETERS[model])
+        if unknown:
+          raise ValueError("%s has no parameters %s" % (model, ", ".join(sorted(unknown))))
+        continue
+      if line.startswith("#"):
+        continue
+      members.append(dict(PARAMETERS[model], **dict(zip(names, map(float, data)))))
+  return members
+
+def ensemble_fluxes(model, state, dx, dt, members):
+  # fluxes on the NX + 1 faces of every member, end faces copied like color_fluxes
+  if model == "linear":
+    u = np.array([member["U"] for member in members])[:, None]
+    F = FLUXES[model](state[:, :, :-1], state[:, :, 1:], dx, dt, u=u)
+  else:
+    F = FLUXES[model](state[:, :, :-1], state[:, :, 1:], dx, dt)
+  return np.concatenate([F[:, :, :1], F, F[:, :, -1:]], axis=2)
+
+def solve_ensemble(model, nx, members, t_final):
+  dx = 1.0 / nx
+  # members keep their own DT and number of steps, finished members stop updating
+  dt = np.array([time_step(model, member) for member in members])[:, None]
+  steps = np.array([num_steps(time_step(model, member), t_final) for member in members])
+  state = np.stack([initial_condition(model, nx, member) for member in members], axis=1)
+  for step in range(steps.max()):
+    F = ensemble_fluxes(model, state, dx, dt, members)
+    updated = state.copy()
+    apply_flux(model, updated, F, dx, dt)
+    state = np.where((step < steps)[:, None], updated, state)
+  return state[:OUTPUT_ROWS[model]]
+
+def member_name(model, nx, member):
+  return "%s_ensemble.%d.%d.txt" % (model, nx, member)
+
+def write_members(model, state):
+  # one file per member in the format of writeCells
+  nx = state.shape[2]
+  for member in range(state.shape[1]):
+    with open(member_name(model, nx, member), "w") as f:
+      for cell in range(nx):
+        f.write(" ".join(["%.17g" % value for value in state[:, member, cell]]) + "\n")
+
+def compare_members(model, state, directory, pool=None):
+  # members whose 1d_fix.rg ENSEMBLE output in directory is not bitwise identical to state,
+  # large shards are read by pool
+  nx = state.shape[2]
+  differ = []
+  for member in range(state.shape[1]):
+    cells = np.ascontiguousarray(read_cells(os.path.join(directory,
+                                                         member_name(model, nx, member)),
+                                               pool).T)
+    if cells.tobytes() != np.ascontiguousarray(state[:, member, :]).tobytes():
+      differ.append(member)
+  return differ
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  constants = read_global_const("global_const.rg")
+
+  parser = argparse.ArgumentParser(description='Run every member of a parameter table in one process.')
+  parser.add_argument('parameters',help='table with a header of parameter names and a row per member')
+  parser.add_argument('--model',choices=PARAMETERS.keys(),default='euler')
+  parser.add_argument('--nx',type=int,
+                      default=constants["CELLS_PER_BLOCK_X"] * constants["LEVEL_1_BLOCKS_X"]
+                      * 2**(constants["MAX_REFINEMENT_LEVEL"] - 1))
+  parser.add_argument('--t-final',type=float,default=constants["T_FINAL"])
+  parser.add_argument('--compare',action='store_true',
+                      help='also run each member alone, check it is bitwise identical and time it')
+  parser.add_argument('--no-write',action='store_true')
+  parser.add_argument('--regent',metavar='DIRECTORY',
+                      help='check the members 1d_fix.rg wrote there with ENSEMBLE are bitwise identical')
+  args = parser.parse_args()
+
+  members = read_parameters(args.parameters, args.model)
+  with phase("solver_launch"):
+    start = time.time()
+    state = solve_ensemble(args.model, args.nx, members, args.t_final)
+    seconds = time.time() - start
+  print("%s %d members NX=%d: %.3f s, %.4g members/s" % (args.model, len(members), args.nx,
+                                                       seconds, len(members) / seconds))
+  if not args.no_write:
+    write_members(args.model, state)
+
+  ERROR = 0
+  if args.compare:
+    start = time.time()
+    for member, params in enumerate(members):
+      alone = solve(args.model, args.nx, 1, 1, args.t_final, params)
+      if alone.tobytes() != state[:, member, :].tobytes():
+        print("member %d differs from its standalone run" % member)
+        ERROR = 1
+    standalone_seconds = time.time() - start
+    print("standalone: %.3f s, %.4g members/s, ensemble speedup %.1f" % (standalone_seconds,
+          len(members) / standalone_seconds, standalone_seconds / seconds))
+  if args.regent:
+    outputs = [os.path.join(args.regent, member_name(args.model, args.nx, member))
+               for member in range(state.shape[1])]
+    with multiprocessing.Pool() if needs_pool(outputs) else contextlib.nullcontext() as pool:
+      differ = compare_members(args.model, state, args.regent, pool)
+    for member in differ:
+      print("member %d of 1d_fix.rg differs from ensemble.py" % member)
+    if differ:
+      ERROR = 1
+  sys.exit(ERROR)
@@ -29,7 +29,6 @@ GAMMA = 1.4
 BETA = (GAMMA + 1.0) / (GAMMA - 1.0)
 
 
-x = np.arange(0.0, 1.01, .01)
 x_jump = 0.5
 t_final = 0.142681382
 
@@ -42,20 +41,32 @@ P_r = 0.1
 rho_r = 0.125
 u_r = 0.0
 
-P_0 = np.zeros(len(x))
-rho_0 = np.zeros(len(x))
-u_0 = np.zeros(len(x))
-
-x_l = np.where(x < 0.5)
-x_r = np.where(x >= 0.5)
-
-P_0[x_l] = P_l
-rho_0[x_l] = rho_l
-u_0[x_l] = u_l
-
-P_0[x_r] = P_r
-rho_0[x_r] = rho_r
-u_0[x_r] = u_r
+_PROFILE = {}
+
+def sod_profile():
+    # plotting grid x and the initial P_0, rho_0, u_0 on it, built on first use so importing
+    # euler.py only costs the numpy import
+    if not _PROFILE:
+        x = np.arange(0.0, 1.01, .01)
+        x_l = np.where(x < 0.5)
+        x_r = np.where(x >= 0.5)
+        P_0 = np.zeros(len(x))
+        rho_0 = np.zeros(len(x))
+        u_0 = np.zeros(len(x))
+        P_0[x_l] = P_l
+        rho_0[x_l] = rho_l
+        u_0[x_l] = u_l
+        P_0[x_r] = P_r
+        rho_0[x_r] = rho_r
+        u_0[x_r] = u_r
+        _PROFILE.update(x=x, x_l=x_l, x_r=x_r, P_0=P_0, rho_0=rho_0, u_0=u_0)
+    return _PROFILE
+
+def __getattr__(name):
+    # euler.x, euler.P_0, ... keep working as lazy module attributes
+    if name in ("x", "x_l", "x_r", "P_0", "rho_0", "u_0"):
+        return sod_profile()[name]
+    raise AttributeError("module 'euler' has no attribute " + repr(name))
 
 def plot_density(density):
     import matplotlib.pyplot as plt
@@ -65,7 +76,7 @@ def plot_density(density):
     plt.ylim([0,1.2])
     plt.xlabel("x")
     plt.xticks([0,0.25,0.5,0.75,1.])
-    plt.plot(x,density)
+    plt.plot(sod_profile()["x"],density)
 
 def plot_speed(speed):
     import matplotlib.pyplot as plt
@@ -75,7 +86,7 @@ def plot_speed(speed):
     #plt.ylim([0,1.2])
     plt.xlabel("x")
     plt.xticks([0,0.25,0.5,0.75,1.])
-    plt.plot(x,speed)
+    plt.plot(sod_profile()["x"],speed)
 
 
 def plot_velocity(velocity):
@@ -86,7 +97,7 @@ def plot_velocity(velocity):
     plt.ylim([0,1.2])
     plt.xlabel("x")
     plt.xticks([0,0.25,0.5,0.75,1.])
-    plt.plot(x,velocity)
+    plt.plot(sod_profile()["x"],velocity)
 
 
 def plot_pressure(pressure):
@@ -97,7 +108,7 @@ def plot_pressure(pressure):
     plt.ylim([0,1.2])
     plt.xlabel("x")
     plt.xticks([0,0.25,0.5,0.75,1.])
-    plt.plot(x,pressure)
+    plt.plot(sod_profile()["x"],pressure)
 
 
 def plot_sie(sie):
@@ -108,23 +119,133 @@ def plot_sie(sie):
     plt.ylim([1,3.0])
     plt.xlabel("x")
     plt.xticks([0,0.25,0.5,0.75,1.])
-    plt.plot(x,sie)
+    plt.plot(sod_profile()["x"],sie)
 
 def specific_internal_energy(P,rho):
     return P / (rho * (GAMMA - 1.0))
 
 def get_energy(P, rho, v):
-    return P / (GAMMA - 1.0) + 0.5 * rho * v**2
+    # v * v rather than v**2, which is pow() for a float, so initializeCells gets the same bits
+    return P / (GAMMA - 1.0) + 0.5 * rho * (v * v)
 
 def get_pressure(E, rho, v):
     return (E - 0.5 * rho * v**2) * (GAMMA-1.0)
 
 def get_flux(E, rho, momentum):
     v = momentum / rho
-    value = np.zeros((3, len(E)))
-    value[0,:] = rho * v
+    value = np.zeros((3,) + np.shape(E))
+    value[0] = rho * v
     P = get_pressure(E, rho, v)
-    value[1,:] = rho * v**2 + P
-    value[2,:] = (E + P) * v
+    value[1] = rho * v**2 + P
+    value[2] = (E + P) * v
     return value
 
+
+# vectorized numerical fluxes on (3, N) states of (density, momentum, energy)
+
+def initial_state(nx, rho_l=rho_l, u_l=u_l, P_l=P_l, rho_r=rho_r, u_r=u_r, P_r=P_r):
+    # Sod shock, or another Riemann problem, on nx cells split like initializeCells in euler.rg
+    U = np.zeros((3, nx))
+    left = np.arange(nx) < nx // 2
+    U[0] = np.where(left, rho_l, rho_r)
+    U[1] = U[0] * np.where(left, u_l, u_r)
+    U[2] = np.where(left, get_energy(P_l, rho_l, u_l), get_energy(P_r, rho_r, u_r))
+    return U
+
+def get_primitive(U):
+    rho = U[0]
+    v = U[1] / rho
+    P = get_pressure(U[2], rho, v)
+    return rho, v, P
+
+def get_sound_speed(P, rho):
+    return np.sqrt(GAMMA * P / rho)
+
+def minmod(a, b):
+    return np.where(a * b > 0.0, np.where(np.abs(a) < np.abs(b), a, b), 0.0)
+
+def reconstruct(U, muscl=False):
+    # left and right states at the N-1 interior faces of N cells
+    if not muscl:
+        return U[:, :-1], U[:, 1:]
+    dU = U[:, 1:] - U[:, :-1]
+    slope = np.zeros_like(U)
+    slope[:, 1:-1] = minmod(dU[:, :-1], dU[:, 1:])
+    return U[:, :-1] + 0.5 * slope[:, :-1], U[:, 1:] - 0.5 * slope[:, 1:]
+
+def lax_friedrichs_flux(U_l, U_r, dx, dt):
+    # the scheme hard coded in euler.rg
+    F_l = get_flux(U_l[2], U_l[0], U_l[1])
+    F_r = get_flux(U_r[2], U_r[0], U_r[1])
+    return 0.5 * (F_l + F_r) + 0.5 * dx * (U_l - U_r) / dt
+
+def rusanov_flux(U_l, U_r, dx, dt):
+    rho_l, v_l, P_l = get_primitive(U_l)
+    rho_r, v_r, P_r = get_primitive(U_r)
+    S = np.maximum(np.abs(v_l) + get_sound_speed(P_l, rho_l),
+                   np.abs(v_r) + get_sound_speed(P_r, rho_r))
+    F_l = get_flux(U_l[2], rho_l, U_l[1])
+    F_r = get_flux(U_r[2], rho_r, U_r[1])
+    return 0.5 * (F_l + F_r) - 0.5 * S * (U_r - U_l)
+
+def wave_speeds(rho_l, v_l, P_l, rho_r, v_r, P_r):
+    # Davis estimates of the slowest and fastest signal speeds
+    c_l = get_sound_speed(P_l, rho_l)
+    c_r = get_sound_speed(P_r, rho_r)
+    return np.minimum(v_l - c_l, v_r - c_r), np.maximum(v_l + c_l, v_r + c_r)
+
+def hll_flux(U_l, U_r, dx, dt):
+    rho_l, v_l, P_l = get_primitive(U_l)
+    rho_r, v_r, P_r = get_primitive(U_r)
+    S_l, S_r = wave_speeds(rho_l, v_l, P_l, rho_r, v_r, P_r)
+    F_l = get_flux(U_l[2], rho_l, U_l[1])
+    F_r = get_flux(U_r[2], rho_r, U_r[1])
+    F_star = (S_r * F_l - S_l * F_r + S_l * S_r * (U_r - U_l)) / (S_r - S_l)
+    return np.where(S_l >= 0.0, F_l, np.where(S_r <= 0.0, F_r, F_star))
+
+def hllc_star_state(U, rho, v, P, S, S_star):
+    # (10.39) Toro
+    factor = rho * (S - v) / (S - S_star)
+    U_star = np.empty_like(U)
+    U_star[0] = factor
+    U_star[1] = factor * S_star
+    U_star[2] = factor * (U[2] / rho + (S_star - v) * (S_star + P / (rho * (S - v))))
+    return U_star
+
+def hllc_flux(U_l, U_r, dx, dt):
+    rho_l, v_l, P_l = get_primitive(U_l)
+    rho_r, v_r, P_r = get_primitive(U_r)
+    S_l, S_r = wave_speeds(rho_l, v_l, P_l, rho_r, v_r, P_r)
+    # (10.37) Toro
+    S_star = ((P_r - P_l + rho_l * v_l * (S_l - v_l) - rho_r * v_r * (S_r - v_r))
+              / (rho_l * (S_l - v_l) - rho_r * (S_r - v_r)))
+    F_l = get_flux(U_l[2], rho_l, U_l[1])
+    F_r = get_flux(U_r[2], rho_r, U_r[1])
+    F_star_l = F_l + S_l * (hllc_star_state(U_l, rho_l, v_l, P_l, S_l, S_star) - U_l)
+    F_star_r = F_r + S_r * (hllc_star_state(U_r, rho_r, v_r, P_r, S_r, S_star) - U_r)
+    return np.where(S_l >= 0.0, F_l,
+           np.where(S_star >= 0.0, F_star_l,
+           np.where(S_r > 0.0, F_star_r, F_r)))
+
+FLUXES = {"lax_friedrichs": lax_friedrichs_flux,
+          "rusanov": rusanov_flux,
+          "hll": hll_flux,
+          "hllc": hllc_flux}
+
+def interface_fluxes(U, dx, dt, flux="hllc", muscl=False):
+    # fluxes on the N+1 faces of N cells, end faces copied to hold end cells constant like euler.rg
+    F = np.empty((3, U.shape[1] + 1))
+    U_l, U_r = reconstruct(U, muscl)
+    F[:, 1:-1] = FLUXES[flux](U_l, U_r, dx, dt)
+    F[:, 0] = F[:, 1]
+    F[:, -1] = F[:, -2]
+    return F
+
+def advance(U, dx, dt, flux="hllc", muscl=False):
+    # forward Euler for first order, Heun (SSP RK2) with MUSCL reconstruction
+    F = interface_fluxes(U, dx, dt, flux, muscl)
+    U_1 = U - dt * (F[:, 1:] - F[:, :-1]) / dx
+    if not muscl:
+        return U_1
+    F = interface_fluxes(U_1, dx, dt, flux, muscl)
+    return 0.5 * (U + U_1 - dt * (F[:, 1:] - F[:, :-1]) / dx)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# Lax-Friedrichs updates of linear_advection.rg and euler.rg on NUM_PARTITIONS worker processes,
+# each owning one color of cells plus the one cell ghosts of declare_bloated_partition.  Every
+# operation follows the order of the Regent tasks so results are bitwise comparable with them
+#
+import numpy as np
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import euler
+from euler import initial_state
+from plan_resolution import MODELS, read_global_const
+from profiling import enable_from_argv
+
+U_LINEAR = 1.0  # U in linear_constants.rg
+
+# model constants a run can change, named as in linear_constants.rg and euler.rg
+PARAMETERS = {"linear": {"U": U_LINEAR},
+              "euler": {"P_L": euler.P_l, "RHO_L": euler.rho_l, "V_L": euler.u_l,
+                        "P_R": euler.P_r, "RHO_R": euler.rho_r, "V_R": euler.u_r}}
+
+# rows of the state written by writeCells, euler's velocity and pressure rows follow them
+OUTPUT_ROWS = {"linear": 1, "euler": 3}
+
+def linear_initial_state(nx):
+  phi = np.zeros((1, nx))
+  phi[0, :nx // 2] = 1.0
+  return phi
+
+def euler_initial_state(nx, params):
+  # density, momentum and energy of euler.initial_state plus the velocity and pressure rows
+  # initializeCells stores, which calculateFlux reads instead of recomputing them
+  U = initial_state(nx, params["RHO_L"], params["V_L"], params["P_L"], params["RHO_R"],
+                    params["V_R"], params["P_R"])
+  left = np.arange(nx) < nx // 2
+  velocity = np.where(left, params["V_L"], params["V_R"])
+  pressure = np.where(left, params["P_L"], params["P_R"])
+  return np.concatenate([U, velocity[None], pressure[None]])
+
+def initial_condition(model, nx, params):
+  if model == "linear":
+    return linear_initial_state(nx)
+  return euler_initial_state(nx, params)
+
+def time_step(model, params):
+  # DT = CFL * MIN_DX / U in linear_constants.rg, fixed in euler.rg
+  if model == "linear":
+    return MODELS[model]["dt"] / params["U"]
+  return MODELS[model]["dt"]
+
+def flux_args(model, params):
+  if model == "linear":
+    return {"u": params["U"]}
+  return {}
+
+def linear_flux(phi_l, phi_r, dx, dt, u=U_LINEAR):
+  return 0.5 * u * (phi_l + phi_r) + 0.5 * dx * (phi_l - phi_r) / dt
+
+def euler_flux(U_l, U_r, dx, dt):
+  # calculateFlux of euler.rg on the stored momentum, velocity and pressure, which rounds
+  # differently from euler.lax_friedrichs_flux recomputing them from the conserved fields
+  rho_l, rhov_l, E_l, v_l, P_l = U_l[:5]
+  rho_r, rhov_r, E_r, v_r, P_r = U_r[:5]
+  F = np.empty((3,) + np.broadcast(rho_l, dt).shape)
+  F[0] = 0.5 * (rhov_l + rhov_r) + 0.5 * dx * (rho_l - rho_r) / dt
+  F[1] = 0.5 * (rhov_l * v_l + P_l + rhov_r * v_r + P_r) + 0.5 * dx * (rhov_l - rhov_r) / dt
+  F[2] = 0.5 * (v_l * (P_l + E_l) + v_r * (P_r + E_r)) + 0.5 * dx * (E_l - E_r) / dt
+  return F
+
+FLUXES = {"linear": linear_flux, "euler": euler_flux}
+
+def apply_flux(model, U, F, dx, dt):
+  # applyFlux in place on the cells of U, then euler's velocity and pressure from the update
+  U[:F.shape[0]] -= dt * (F[..., 1:] - F[..., :-1]) / dx
+  if model == "euler":
+    U[3] = U[1] / U[0]
+    U[4] = (U[2] - 0.5 * U[1] * U[3]) * (euler.GAMMA - 1.0)
+
+def num_steps(dt, t_final):
+  # same loop as 1d_fix.rg
+  steps = 0
+  t = 0.0
+  while t < t_final - dt:
+    t += dt
+    steps += 1
+  return steps
+
+def color_cells(num_blocks, cells_per_block, num_partitions):
+  # first and last cell of each color, blocks split evenly like partition(equal, ...)
+  bounds = []
+  first_block = 0
+  for color in range(num_partitions):
+    blocks = num_blocks // num_partitions + (1 if color < num_blocks % num_partitions else 0)
+    bounds.append((first_block * cells_per_block, (first_block + blocks) * cells_per_block - 1))
+    first_block += blocks
+  return bounds
+
+def color_fluxes(model, bloated, first, last, nx, dx, dt, args=None):
+  # fluxes on the last - first + 2 faces of a color, from its cells plus ghosts
+  F = FLUXES[model](bloated[:, :-1], bloated[:, 1:], dx, dt, **(args or {}))
+  # boundary conditions: hold end cells constant in time
+  if first == 0:
+    F = np.concatenate([F[:, :1], F], axis=1)
+  if last == nx - 1:
+    F = np.concatenate([F, F[:, -1:]], axis=1)
+  return F
+
+def advance_color(model, state, first, last, nx, dx, dt, barrier=None, args=None):
+  lo = max(first - 1, 0)
+  hi = min(last + 1, nx - 1)
+  F = color_fluxes(model, state[:, lo:hi + 1], first, last, nx, dx, dt, args)
+  # every color has read its ghosts before any color writes
+  if barrier is not None:
+    barrier.wait()
+  apply_flux(model, state[:, first:last + 1], F, dx, dt)
+
+def advance_local(model, U, lo, hi, nx, dx, dt, args=None):
+  # one step of the cells lo to hi in U with a face on both sides, like advanceCells
+  F = color_fluxes(model, U, lo, hi, nx, dx, dt, args)
+  start = 0 if lo == 0 else 1
+  stop = U.shape[1] if hi == nx - 1 else U.shape[1] - 1
+  apply_flux(model, U[:, start:stop], F, dx, dt)
+
+def advance_color_steps(model, state, first, last, nx, dx, dt, steps, barrier=None, args=None):
+  # steps of a color from one exchange of steps ghosts on each side, the ghosts go stale a cell
+  # per step from the edge so the owned cells are still exact after the last step
+  lo = max(first - steps, 0)
+  hi = min(last + steps, nx - 1)
+  U = state[:, lo:hi + 1].copy()
+  # every color has read its ghosts before any color writes
+  if barrier is not None:
+    barrier.wait()
+  for step in range(steps):
+    advance_local(model, U, lo, hi, nx, dx, dt, args)
+  state[:, first:last + 1] = U[:, first - lo:last - lo + 1]
+
+def worker(model, name, shape, first, last, dx, dt, steps, barrier, args, halo_depth=1):
+  shm = shared_memory.SharedMemory(name=name)
+  state = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+  try:
+    if halo_depth == 1:
+      for step in range(steps):
+        advance_color(model, state, first, last, shape[1], dx, dt, barrier, args)
+        # every color has written before the next step reads ghosts
+        barrier.wait()
+    else:
+      for start in range(0, steps, halo_depth):
+        advance_color_steps(model, state, first, last, shape[1], dx, dt,
+                            min(halo_depth, steps - start), barrier, args)
+        barrier.wait()
+  except Exception:
+    # the other colors would wait at the barrier forever, break it so they exit too
+    barrier.abort()
+    raise
+  finally:
+    del state
+    shm.close()
+
+def exchanges(steps, halo_depth):
+  # ghost exchange rounds of a run
+  return -(-steps // halo_depth)
+
+def solve(model, num_blocks, cells_per_block, num_partitions, t_final, params=None,
+          halo_depth=1):
+  # params overrides entries of PARAMETERS[model], halo_depth steps per ghost exchange like
+  # HALO_DEPTH in 1d_fix.rg
+  params = dict(PARAMETERS[model], **(params or {}))
+  nx = num_blocks * cells_per_block
+  dx = 1.0 / nx
+  dt = time_step(model, params)
+  args = flux_args(model, params)
+  steps = num_steps(dt, t_final)
+  initial = initial_condition(model, nx, params)
+  bounds = color_cells(num_blocks, cells_per_block, num_partitions)
+
+  if num_partitions == 1:
+    state = initial.copy()
+    for step in range(steps):
+      advance_color(model, state, 0, nx - 1, nx, dx, dt, args=args)
+    return state[:OUTPUT_ROWS[model]]
+
+  shm = shared_memory.SharedMemory(create=True, size=initial.nbytes)
+  try:
+    state = np.ndarray(initial.shape, dtype=np.float64, buffer=shm.buf)
+    state[:] = initial
+    barrier = multiprocessing.Barrier(num_partitions)
+    workers = [multiprocessing.Process(target=worker, args=(model, shm.name, initial.shape, first,
+                                                            last, dx, dt, steps, barrier, args,
+                                                            halo_depth))
+               for first, last in bounds]
+    for process in workers:
+      process.start()
+    for process in workers:
+      process.join()
+    for process in workers:
+      if process.exitcode != 0:
+        raise RuntimeError("worker exited with code " + str(process.exitcode))
+    result = state[:OUTPUT_ROWS[model]].copy()
+    del state
+  finally:
+    shm.close()
+    shm.unlink()
+  return result
+
+def write_cells(model, state):
+  # same files as writeCells
+  nx = state.shape[1]
+  with open(model + "." + str(nx) + ".txt", "w") as f:
+    for cell in range(nx):
+      f.write(" ".join(["%.17g" % value for value in state[:, cell]]) + "\n")
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  constants = read_global_const("global_const.rg")
+
+  parser = argparse.ArgumentParser(description='Strong scaling of the fixed grid Lax-Friedrichs update on shared memory worker processes.')
+  parser.add_argument('--model',choices=MODELS.keys(),default='linear')
+  parser.add_argument('--cells-per-block-x',type=int,default=constants["CELLS_PER_BLOCK_X"])
+  parser.add_argument('--blocks-x',type=int,
+                      default=constants["LEVEL_1_BLOCKS_X"] * 2**(constants["MAX_REFINEMENT_LEVEL"] - 1),
+                      help='blocks at the finest level')
+  parser.add_argument('--t-final',type=float,default=constants["T_FINAL"])
+  parser.add_argument('--max-partitions',type=int,default=os.cpu_count())
+  parser.add_argument('--write',action='store_true',help='write the result like writeCells')
+  parser.add_argument('--halo-depth',type=int,default=constants.get("HALO_DEPTH", 1),
+                      help='time steps per ghost exchange')
+  args = parser.parse_args()
+
+  nx = args.cells_per_block_x * args.blocks_x
+  steps = num_steps(MODELS[args.model]["dt"], args.t_final)
+  print("%s NX=%d %d steps %d ghost exchanges" % (args.model, nx, steps,
+                                                 exchanges(steps, args.halo_depth)))
+  print("%-10s %-10s %-16s %-8s %s" % ("partitions", "seconds", "cell updates/s", "speedup",
+                                       "bitwise"))
+
+  ERROR = 0
+  reference = None
+  serial_seconds = None
+  for num_partitions in range(1, min(args.max_partitions, args.blocks_x) + 1):
+    start = time.time()
+    state = solve(args.model, args.blocks_x, args.cells_per_block_x, num_partitions, args.t_final,
+                  halo_depth=args.halo_depth)
+    seconds = time.time() - start
+    if reference is None:
+      reference = state
+      serial_seconds = seconds
+      if args.write:
+        write_cells(args.model, state)
+    identical = reference.tobytes() == state.tobytes()
+    if not identical:
+      ERROR = 1
+    print("%-10d %-10.3f %-16.4g %-8.2f %s" % (num_partitions, seconds, nx * steps / seconds,
+                                               serial_seconds / seconds, identical))
+  sys.exit(ERROR)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# memory, ghost exchange and task launches of a 1d_amr.rg or 1d_fix.rg run before launching it,
+# from global_const.rg and the model's CellValues and FaceValues fspaces
+#
+import argparse
+import os
+import re
+import sys
+
+from plan_resolution import read_global_const
+from profiling import enable_from_argv
+
+# bytes of the field types used in fspaces, REAL comes from PRECISION
+TYPE_BYTES = {"double": 8, "float": 4, "int64": 8, "int32": 4, "int": 4, "int8": 1, "bool": 1,
+              "int1d": 8}
+PRECISION_BYTES = {"double": 8, "single": 4}
+
+MODEL_FILES = {"linear": "linear_constants.rg", "euler": "euler.rg"}
+DRIVERS = ["1d_amr.rg", "1d_fix.rg"]
+
+# a point task should update at least this many cells to hide Legion's launch overhead
+MIN_CELLS_PER_PARTITION = 4096
+MEMORY_FRACTION = 0.8
+
+def read_fspaces(filename, precision="double", halo_depth=1):
+  # field names and sizes of every fspace in a Regent file, and of a CellValues from
+  # make_cell_values with the <field>_copy of its HALO_FIELDS when halo_depth > 1
+  type_bytes = dict(TYPE_BYTES, REAL=PRECISION_BYTES[precision])
+  with open(filename, "r") as f:
+    text = re.sub(r"--[^\n]*", "", f.read())
+  fspaces = {}
+  for name, body in re.findall(r"fspace\s+(\w+)\s*{([^}]*)}", text):
+    fields = {}
+    for field in body.split(","):
+      if ":" not in field:
+        continue
+      field_name, field_type = [entry.strip() for entry in field.split(":")]
+      fields[field_name] = type_bytes[field_type]
+    fspaces[name] = fields
+  halo_fields = re.search(r"HALO_FIELDS\s*=\s*{([^}]*)}", text)
+  for name, body in re.findall(r"(\w+)\s*=\s*make_cell_values\(\s*{((?:\s*{[^}]*},?)*)\s*}\s*\)",
+                               text):
+    fields = {}
+    for field_name, field_type in re.findall(r'{\s*"(\w+)"\s*,\s*(\w+)\s*}', body):
+      fields[field_name] = type_bytes[field_type]
+    if halo_depth > 1 and halo_fields:
+      for field_name in re.findall(r'"(\w+)"', halo_fields.group(1)):
+        fields[field_name + "_copy"] = fields[field_name]
+    fspaces[name] = fields
+  return fspaces
+
+def fspace_bytes(fspace):
+  return sum(fspace.values())
+
+def partition_sizes(num_elements, num_partitions):
+  # smallest and largest subregion of partition(equal, ...)
+  return num_elements // num_partitions, -(-num_elements // num_partitions)
+
+def halo_depth(constants, driver):
+  # ghost cells of the bloated cell partitions, HALO_DEPTH only widens those of 1d_fix.rg
+  if driver == "1d_fix.rg":
+    return constants.get("HALO_DEPTH", 1)
+  return 1
+
+def level_regions(constants, cell_bytes, face_bytes, meta_bytes, depth=1):
+  # one row per region of make_level_regions: (level, region, elements, bytes), the bloated cell
+  # partitions overlap by depth cells
+  cells_per_block = constants["CELLS_PER_BLOCK_X"]
+  num_partitions = constants["NUM_PARTITIONS"]
+  rows = []
+  for level in range(1, constants["MAX_REFINEMENT_LEVEL"] + 1):
+    num_metas = constants["LEVEL_1_BLOCKS_X"] * 2**(level - 1)
+    num_cells = cells_per_block * num_metas
+    num_faces = num_cells + num_partitions
+    # bloated partitions overlap their neighbors by a cell or block on each side, and each
+    # subregion becomes its own instance once the colors live in different memories
+    ghosts = 2 * (num_partitions - 1)
+    rows.append((level, "cells", num_cells, num_cells * cell_bytes))
+    rows.append((level, "faces", num_faces, num_faces * face_bytes))
+    rows.append((level, "meta", num_metas, num_metas * meta_bytes))
+    rows.append((level, "bloated cell ghosts", depth * ghosts, depth * ghosts * cell_bytes))
+    rows.append((level, "bloated meta ghosts", ghosts, ghosts * meta_bytes))
+    if level > 1:
+      rows.append((level, "bloated by parent ghosts", ghosts, ghosts * (cell_bytes + meta_bytes)))
+  return rows
+
+def ghost_exchange_bytes(constants, cell_bytes, driver="1d_amr.rg"):
+  # cells read through bloated partitions each exchange: calculateFlux/calculateAMRFlux and
+  # interpolateGhostChildren read a ghost on each side of a color at their level and, below the
+  # finest level, at the next finer level through the bloated partition by parent.  1d_fix.rg
+  # reads HALO_DEPTH ghosts of the finest level once per HALO_DEPTH steps
+  ghosts = 2 * (constants["NUM_PARTITIONS"] - 1)
+  if driver == "1d_fix.rg":
+    return halo_depth(constants, driver) * ghosts * cell_bytes
+  max_level = constants["MAX_REFINEMENT_LEVEL"]
+  flux = ghosts * max_level + ghosts * (max_level - 1)
+  interpolate = 2 * ghosts * (max_level - 1)
+  return (flux + interpolate) * cell_bytes
+
+def index_launches(constants, driver="1d_amr.rg"):
+  # index launches per call of make_time_step, make_flag_regrid and make_do_regrid, or per
+  # ghost exchange of 1d_fix.rg: calculateFlux and applyFlux, or one advanceCells
+  if driver == "1d_fix.rg":
+    return {"time_step": 1 if halo_depth(constants, driver) > 1 else 2}
+  L = constants["MAX_REFINEMENT_LEVEL"]
+  time_step = L + (L - 1) + (L - 1) + 1 + L
+  flag_regrid = (L - 1) + 1 + L
+  do_regrid = 2 * (L - 1) + 2 * (L - 1) * L // 2
+  return {"time_step": time_step, "flag_regrid": flag_regrid, "do_regrid": do_regrid}
+
+def node_memory():
+  try:
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+  except (ValueError, OSError, AttributeError):
+    return None
+
+def warnings(constants, total_bytes, memory, min_cells):
+  messages = []
+  num_partitions = constants["NUM_PARTITIONS"]
+  if memory and total_bytes > MEMORY_FRACTION * memory:
+    messages.append("regions need %s, more than %d%% of the %s node memory"
+                    % (human(total_bytes), 100 * MEMORY_FRACTION, human(memory)))
+  if constants["LEVEL_1_BLOCKS_X"] < num_partitions:
+    messages.append("level 1 has %d blocks for %d partitions, some colors are empty"
+                    % (constants["LEVEL_1_BLOCKS_X"], num_partitions))
+  finest_cells = (constants["CELLS_PER_BLOCK_X"] * constants["LEVEL_1_BLOCKS_X"]
+                  * 2**(constants["MAX_REFINEMENT_LEVEL"] - 1))
+  smallest, largest = partition_sizes(finest_cells, num_partitions)
+  if largest < min_cells:
+    messages.append("at most %d cells per partition at the finest level, fewer than %d to "
+                    "amortize launch overhead, lower NUM_PARTITIONS" % (largest, min_cells))
+  return messages
+
+def human(num_bytes):
+  for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+    if num_bytes < 1024 or unit == "TiB":
+      return "%.1f %s" % (num_bytes, unit)
+    num_bytes /= 1024.0
+
+def print_plan(constants, fspaces, memory=None, min_cells=MIN_CELLS_PER_PARTITION,
+               driver="1d_amr.rg"):
+  cell_bytes = fspace_bytes(fspaces["CellValues"])
+  face_bytes = fspace_bytes(fspaces["FaceValues"])
+  meta_bytes = fspace_bytes(fspaces["RefinementBits"])
+  print("CellValues %d bytes FaceValues %d bytes RefinementBits %d bytes"
+        % (cell_bytes, face_bytes, meta_bytes))
+  print("%-6s %-26s %-12s %s" % ("level", "region", "elements", "bytes"))
+  total_bytes = 0
+  depth = halo_depth(constants, driver)
+  for level, region, elements, num_bytes in level_regions(constants, cell_bytes, face_bytes,
+                                                          meta_bytes, depth):
+    print("%-6d %-26s %-12d %d" % (level, region, elements, num_bytes))
+    total_bytes += num_bytes
+  print("total %d bytes (%s)" % (total_bytes, human(total_bytes)))
+  print("")
+  num_partitions = constants["NUM_PARTITIONS"]
+  print("%-6s %-22s %s" % ("level", "cells per partition", "blocks per partition"))
+  for level in range(1, constants["MAX_REFINEMENT_LEVEL"] + 1):
+    num_metas = constants["LEVEL_1_BLOCKS_X"] * 2**(level - 1)
+    blocks = partition_sizes(num_metas, num_partitions)
+    cells = [constants["CELLS_PER_BLOCK_X"] * b for b in blocks]
+    print("%-6d %-22s %s" % (level, "%d-%d" % tuple(cells), "%d-%d" % blocks))
+  print("")
+  # advanceCells only reads the _copy fields of the ghosts
+  copy_bytes = sum([size for name, size in fspaces["CellValues"].items() if name.endswith("_copy")])
+  exchange_bytes = ghost_exchange_bytes(constants, copy_bytes if depth > 1 else cell_bytes, driver)
+  if depth > 1:
+    print("ghost exchange %d bytes per %d time steps" % (exchange_bytes, depth))
+  else:
+    print("ghost exchange %d bytes per time step" % exchange_bytes)
+  launches = index_launches(constants, driver)
+  for phase in [phase for phase in ["time_step", "flag_regrid", "do_regrid"] if phase in launches]:
+    print("%-12s %3d index launches, %d point tasks" % (phase, launches[phase],
+                                                         launches[phase] * num_partitions))
+  messages = warnings(constants, total_bytes, memory, min_cells)
+  for message in messages:
+    print("WARNING: " + message)
+  return messages
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Memory, ghost exchange and task launches of a 1d_amr.rg or 1d_fix.rg run.')
+  parser.add_argument('--driver',choices=DRIVERS,default='1d_amr.rg',
+                      help='1d_fix.rg widens the ghosts to HALO_DEPTH cells')
+  parser.add_argument('--global-const',default='global_const.rg')
+  parser.add_argument('--model',choices=MODEL_FILES.keys(),default='linear')
+  parser.add_argument('--model-file',help='Regent file with the CellValues and FaceValues fspaces')
+  parser.add_argument('--node-memory',type=float,help='GiB per node, default this machine')
+  parser.add_argument('--min-cells-per-partition',type=int,default=MIN_CELLS_PER_PARTITION)
+  parser.add_argument('--strict',action='store_true',help='exit 1 on any warning')
+  args = parser.parse_args()
+
+  constants = read_global_const(args.global_const)
+  precision = constants.get("PRECISION", "double")
+  fspaces = read_fspaces(args.model_file or MODEL_FILES[args.model], precision,
+                         constants.get("HALO_DEPTH", 1))
+  fspaces.update(read_fspaces("refinement_bits.rg", precision))
+  memory = args.node_memory * 1024**3 if args.node_memory else node_memory()
+
+  messages = print_plan(constants, fspaces, memory, args.min_cells_per_partition, args.driver)
+  if args.strict and messages:
+    sys.exit(1)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import numpy as np
+import argparse
+import re
+import sys
+from profiling import enable_from_argv
+
+# fixed time step and the largest stable NX for it, from linear_constants.rg and euler.rg, and the
+# T_FINAL of each model's convergence tests
+MODELS = {"linear": {"dt": 0.5 / 640, "max_nx": 640, "t_final": 0.25},
+          "euler": {"dt": 0.2 / 3200, "max_nx": 3200, "t_final": 0.142681382}}
+
+GLOBAL_CONST_ORDER = ["CELLS_PER_BLOCK_X", "LEVEL_1_BLOCKS_X", "MAX_REFINEMENT_LEVEL",
+                      "NUM_PARTITIONS", "T_FINAL", "LENGTH_X", "PRECISION",
+                      "DIAGNOSTICS_INTERVAL", "PREVIEW", "HALO_DEPTH"]
+
+def read_global_const(filename):
+  constants = {}
+  with open(filename, "r") as f:
+    for line in f:
+      line = line.split("--")[0].strip()
+      if "=" not in line:
+        continue
+      name, value = [entry.strip() for entry in line.split("=", 1)]
+      if value.startswith('"'):
+        constants[name] = value.strip('"')
+      elif value in ("true", "false"):
+        constants[name] = (value == "true")
+      elif ("." in value) or ("e" in value.lower()):
+        constants[name] = float(value)
+      else:
+        constants[name] = int(value)
+  return constants
+
+def lua_value(value):
+  # bool before str, it is also an int
+  if isinstance(value, bool):
+    return "true" if value else "false"
+  if isinstance(value, str):
+    return '"' + value + '"'
+  return str(value)
+
+def write_global_const(f, constants):
+  f.write("-- required global constants\n")
+  for name in GLOBAL_CONST_ORDER + sorted(set(constants) - set(GLOBAL_CONST_ORDER)):
+    if name not in constants:
+      continue
+    comment = ""
+    if name == "CELLS_PER_BLOCK_X":
+      comment = " -- must be multiple of 2"
+    f.write(name + " = " + lua_value(constants[name]) + comment + "\n")
+
+def update_global_const(filename, values):
+  # sets values in an existing global_const.rg, keeping its other lines and comments; names it
+  # does not have yet are appended
+  with open(filename, "r") as f:
+    lines = f.readlines()
+  missing = dict(values)
+  for i, line in enumerate(lines):
+    match = re.match(r"^(\s*)(\w+)(\s*=\s*)(.*?)(\s*--.*)?$", line.rstrip("\n"))
+    if match and match.group(2) in missing:
+      value = lua_value(missing.pop(match.group(2)))
+      lines[i] = (match.group(1) + match.group(2) + match.group(3) + value + (match.group(5) or "")
+                  + "\n")
+  if lines and not lines[-1].endswith("\n"):
+    lines[-1] += "\n"
+  for name, value in missing.items():
+    lines.append(name + " = " + lua_value(value) + "\n")
+  with open(filename, "w") as f:
+    f.writelines(lines)
+
+def read_history(filename):
+  # rows of "NX L2" from earlier runs
+  NX = []
+  L2 = []
+  with open(filename, "r") as f:
+    for line in f:
+      data = line.split("#")[0].split()
+      if len(data) >= 2:
+        NX.append(float(data[0]))
+        L2.append(float(data[1]))
+  return NX, L2
+
+def measure_history(model, filenames, dtype=np.float64):
+  # dtype is the storage of the PRECISION the files were written with
+  if model == "linear":
+    from analyze_linear import measure_error
+  else:
+    from analyze_euler import measure_error
+  NX = []
+  L2 = []
+  for filename in filenames:
+    NX.append(float(filename.split('.')[1]))
+    L2.append(measure_error(filename, dtype)[0])
+  return NX, L2
+
+def fit_order(NX, L2):
+  # least squares L2 = A * NX**-p
+  fit = np.polyfit(np.log(NX), np.log(L2), 1)
+  return -fit[0], np.exp(fit[1])
+
+def richardson_order(NX, L2):
+  # observed order from the two finest runs
+  order = np.argsort(NX)
+  coarse, fine = order[-2], order[-1]
+  return np.log(L2[coarse] / L2[fine]) / np.log(NX[fine] / NX[coarse])
+
+def predict_error(NX, L2, nx):
+  # the more pessimistic of the global fit and the extrapolation from the finest run
+  NX = np.asarray(NX, dtype=float)
+  L2 = np.asarray(L2, dtype=float)
+  p, A = fit_order(NX, L2)
+  fit = A * nx**-p
+  if len(NX) < 2:
+    return fit
+  p_rich = richardson_order(NX, L2)
+  finest = np.argmax(NX)
+  extrapolated = L2[finest] * (NX[finest] / nx)**p_rich
+  return np.maximum(fit, extrapolated)
+
+def default_t_final(model, constants):
+  # the configured T_FINAL, the model's convergence tests only without one
+  return constants.get("T_FINAL", MODELS[model]["t_final"])
+
+def num_steps(model, t_final):
+  # time steps of the 1d_fix.rg loop with the model's fixed DT
+  dt = MODELS[model]["dt"]
+  steps = 0
+  t = 0.0
+  while t < t_final - dt:
+    t += dt
+    steps += 1
+  return steps
+
+def total_work(level, cells, blocks):
+  # cells of the regions 1d_fix.rg declares for every level up to level, then finest level blocks
+  # looped over by each task
+  return cells * blocks * (2**level - 1), blocks * 2**(level - 1)
+
+def plan(model, NX, L2, target, t_final, cells_per_block=None, level_1_blocks=None,
+         max_level=10, max_blocks=64):
+  # only NX up to the model's MAX_NX, the DT in the model is not stable past it
+  best = None
+  cell_choices = [cells_per_block] if cells_per_block else range(2, 65, 2)
+  block_choices = [level_1_blocks] if level_1_blocks else range(1, max_blocks + 1)
+  steps = num_steps(model, t_final)
+  for level in range(1, max_level + 1):
+    for cells in cell_choices:
+      for blocks in block_choices:
+        nx = cells * blocks * 2**(level - 1)
+        if nx > MODELS[model]["max_nx"]:
+          continue
+        error = predict_error(NX, L2, nx)
+        if error > target:
+          continue
+        # equal cell steps are decided by the total work
+        candidate = (nx * steps, total_work(level, cells, blocks), level, cells, blocks, nx, error)
+        if (best is None) or (candidate < best):
+          best = candidate
+  if best is None:
+    return None
+  return best[:1] + best[2:]
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Cheapest fixed grid resolution meeting a target L2 error.')
+  parser.add_argument('text_files',nargs='*',help='output files of earlier runs, e.g. linear.80.txt')
+  parser.add_argument('--model',choices=MODELS.keys(),default='linear')
+  parser.add_argument('--history',help='file of "NX L2" rows instead of output files')
+  parser.add_argument('--target',type=float,required=True,help='L2 error to reach')
+  parser.add_argument('--global-const',default='global_const.rg',
+                      help='constants to carry over into the new global_const.rg')
+  parser.add_argument('--t-final',type=float,
+                      help="default T_FINAL of --global-const, else the model's convergence tests")
+  parser.add_argument('--precision',choices=["double", "single"],
+                      help='PRECISION the output files were written with, default that of --global-const')
+  parser.add_argument('--cells-per-block-x',type=int)
+  parser.add_argument('--level-1-blocks-x',type=int)
+  parser.add_argument('-o','--output',help='write the new global_const.rg here instead of stdout')
+  args = parser.parse_args()
+
+  constants = read_global_const(args.global_const)
+  if args.history:
+    NX, L2 = read_history(args.history)
+  else:
+    from analyze_linear import PRECISIONS
+    NX, L2 = measure_history(args.model, args.text_files,
+                             PRECISIONS[args.precision or constants.get("PRECISION", "double")])
+  if len(NX) < 2:
+    print("need the L2 error of at least two resolutions")
+    sys.exit(1)
+
+  p, A = fit_order(NX, L2)
+  print("# least squares order %.3f constant %.4g" % (p, A), file=sys.stderr)
+  print("# Richardson order from the two finest runs %.3f" % richardson_order(NX, L2),
+        file=sys.stderr)
+
+  t_final = args.t_final or default_t_final(args.model, constants)
+  best = plan(args.model, NX, L2, args.target, t_final, args.cells_per_block_x,
+              args.level_1_blocks_x)
+  if best is None:
+    print("no configuration up to MAX_NX %d reaches L2 %g, lower DT in the model for finer grids"
+          % (MODELS[args.model]["max_nx"], args.target))
+    sys.exit(1)
+  cost, level, cells, blocks, nx, error = best
+  print("# NX %d predicted L2 %.4g cost %d cell steps" % (nx, error, cost), file=sys.stderr)
+
+  constants["T_FINAL"] = t_final
+  constants["CELLS_PER_BLOCK_X"] = cells
+  constants["LEVEL_1_BLOCKS_X"] = blocks
+  constants["MAX_REFINEMENT_LEVEL"] = level
+  if args.output:
+    with open(args.output, "w") as f:
+      write_global_const(f, constants)
+  else:
+    write_global_const(sys.stdout, constants)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# level of detail previews of cell output: per bin count, min, max and mean at a few fixed
+# resolutions, written next to the full data as <output file>.preview with rows of
+# "bins bin count min max mean" (only bins holding cells), so partition files merge
+#
+import numpy as np
+import os
+
+# the bin counts the writers in preview.rg use
+LOD_BINS = [256, 1024, 4096]
+
+def bin_cells(x, values, bins, length_x=1.0):
+  # (count, min, max, mean) per bin of [0, length_x), NaN where a bin holds no cell
+  x = np.asarray(x, dtype=np.float64)
+  values = np.asarray(values, dtype=np.float64)
+  index = np.clip((x / length_x * bins).astype(np.int64), 0, bins - 1)
+  count = np.bincount(index, minlength=bins)
+  total = np.bincount(index, weights=values, minlength=bins)
+  minimum = np.full(bins, np.inf)
+  maximum = np.full(bins, -np.inf)
+  np.minimum.at(minimum, index, values)
+  np.maximum.at(maximum, index, values)
+  empty = count == 0
+  minimum[empty] = np.nan
+  maximum[empty] = np.nan
+  mean = np.full(bins, np.nan)
+  mean[~empty] = total[~empty] / count[~empty]
+  return count, minimum, maximum, mean
+
+def merge(lod, bins, rows):
+  # add rows of (bin, count, min, max, mean) to the level with that many bins
+  if bins not in lod:
+    lod[bins] = (np.zeros(bins, dtype=np.int64), np.full(bins, np.nan), np.full(bins, np.nan),
+                 np.full(bins, np.nan))
+  count, minimum, maximum, mean = lod[bins]
+  for bin, n, low, high, average in rows:
+    if count[bin] == 0:
+      minimum[bin] = low
+      maximum[bin] = high
+      mean[bin] = average
+    else:
+      minimum[bin] = min(minimum[bin], low)
+      maximum[bin] = max(maximum[bin], high)
+      mean[bin] = (mean[bin] * count[bin] + average * n) / (count[bin] + n)
+    count[bin] += n
+  return lod
+
+def preview_name(filename):
+  return filename + ".preview"
+
+def write_preview(filename, x, values, length_x=1.0, resolutions=LOD_BINS):
+  with open(preview_name(filename), "w") as f:
+    for bins in resolutions:
+      count, minimum, maximum, mean = bin_cells(x, values, bins, length_x)
+      for bin in np.nonzero(count)[0]:
+        f.write("%d %d %d %.17g %.17g %.17g\n" % (bins, bin, count[bin], minimum[bin],
+                                                   maximum[bin], mean[bin]))
+
+def read_preview(filenames):
+  # merged levels of detail {bins: (count, min, max, mean)} from the previews of the output
+  # files, None when any of them has no preview
+  lod = {}
+  for filename in filenames:
+    if not os.path.exists(preview_name(filename)):
+      return None
+    rows = {}
+    with open(preview_name(filename), "r") as f:
+      for line in f:
+        data = line.split()
+        if len(data) != 6:
+          continue
+        rows.setdefault(int(data[0]), []).append((int(data[1]), int(data[2]), float(data[3]),
+                                                  float(data[4]), float(data[5])))
+    for bins, level in rows.items():
+      merge(lod, bins, level)
+  return lod
+
+def select_lod(available, width):
+  # the coarsest level with at least one bin per pixel of the figure, None if only the full
+  # data is fine enough
+  for bins in sorted(available):
+    if bins >= width:
+      return bins
+  return None
+
+def figure_width(figsize=None, dpi=None):
+  # pixels across the figure matplotlib will draw, from its defaults unless given
+  if figsize is None or dpi is None:
+    import matplotlib
+    figsize = figsize or matplotlib.rcParams["figure.figsize"]
+    dpi = dpi or matplotlib.rcParams["figure.dpi"]
+  return int(np.ceil(figsize[0] * dpi))
+
+def lod_points(lod, bins, length_x=1.0):
+  # bin centers and the min, max and mean of the bins holding cells, ready for fill_between
+  count, minimum, maximum, mean = lod[bins]
+  held = count > 0
+  x = (np.arange(bins) + 0.5) * length_x / bins
+  return x[held], minimum[held], maximum[held], mean[held]
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# shared --profile switch for the Python entry points: cProfile, tracemalloc and named phase
+# timers (solver_launch, file_load, analytic, plot) written as a JSON report at exit
+#
+import os
+import sys
+import time
+
+from contextlib import contextmanager
+
+# phase name -> {"count", "seconds"}, seconds exclusive of phases started inside it
+PHASES = {}
+_stack = []
+_state = {}
+
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+
+def start_phase(name):
+  now = time.perf_counter()
+  if _stack:
+    # time the enclosing phase spent so far is its own
+    _charge(_stack[-1][0], now - _stack[-1][1], 0)
+  _stack.append([name, now])
+
+def stop_phase():
+  now = time.perf_counter()
+  name, start = _stack.pop()
+  _charge(name, now - start, 1)
+  if _stack:
+    _stack[-1][1] = now
+
+def _charge(name, seconds, count):
+  entry = PHASES.setdefault(name, {"count": 0, "seconds": 0.0})
+  entry["count"] += count
+  entry["seconds"] += seconds
+
+@contextmanager
+def phase(name):
+  start_phase(name)
+  try:
+    yield
+  finally:
+    stop_phase()
+
+def default_report_name(script):
+  return os.path.splitext(os.path.basename(script))[0] + ".profile.json"
+
+def enable_from_argv(argv=None):
+  # takes --profile or --profile=<report.json> out of argv, so argparse never sees it, and
+  # starts profiling; returns the report name or None
+  if argv is None:
+    argv = sys.argv
+  for i in range(1, len(argv)):
+    if argv[i] == "--profile" or argv[i].startswith("--profile="):
+      arg = argv.pop(i)
+      report = arg.split("=", 1)[1] if "=" in arg else default_report_name(argv[0])
+      start(report, argv)
+      return report
+  return None
+
+def start(report, argv=None):
+  # the profilers are only imported when asked for, phase() alone costs nothing at import
+  import atexit
+  import cProfile
+  import tracemalloc
+  _state["report"] = report
+  _state["argv"] = list(sys.argv if argv is None else argv)
+  _state["start"] = time.perf_counter()
+  tracemalloc.start()
+  _state["profiler"] = cProfile.Profile()
+  _state["profiler"].enable()
+  atexit.register(write_report)
+
+def function_rows(stats, limit=TOP_FUNCTIONS):
+  rows = []
+  for (filename, line, function), (primitive, calls, total, cumulative, callers) in \
+      stats.stats.items():
+    rows.append({"function": "%s:%d(%s)" % (filename, line, function), "calls": calls,
+                 "total_seconds": total, "cumulative_seconds": cumulative})
+  rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+  return rows[:limit]
+
+def allocation_rows(snapshot, limit=TOP_ALLOCATIONS):
+  rows = []
+  for stat in snapshot.statistics("lineno")[:limit]:
+    frame = stat.traceback[0]
+    rows.append({"location": "%s:%d" % (frame.filename, frame.lineno), "bytes": stat.size,
+                 "count": stat.count})
+  return rows
+
+def write_report():
+  import json
+  import pstats
+  import tracemalloc
+  if "profiler" not in _state:
+    return
+  profiler = _state.pop("profiler")
+  profiler.disable()
+  wall = time.perf_counter() - _state["start"]
+  while _stack:
+    stop_phase()
+  snapshot = tracemalloc.take_snapshot()
+  current, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  report = _state["report"]
+  # the raw cProfile data next to the report for pstats or snakeviz
+  dump = os.path.splitext(report)[0] + ".prof"
+  profiler.dump_stats(dump)
+  phases = {name: dict(entry) for name, entry in PHASES.items()}
+  accounted = sum([entry["seconds"] for entry in phases.values()])
+  result = {"script": os.path.basename(_state["argv"][0]),
+            "argv": _state["argv"][1:],
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_seconds": wall,
+            "phases": phases,
+            "other_seconds": wall - accounted,
+            "functions": function_rows(pstats.Stats(dump)),
+            "memory": {"current_bytes": current, "peak_bytes": peak,
+                       "top": allocation_rows(snapshot)},
+            "cprofile": dump}
+  with open(report, "w") as f:
+    json.dump(result, f, indent=1)
+
+  print("profile: %.3f s wall, %.1f MiB peak traced, report %s" % (wall, peak / 1048576.0, report),
+        file=sys.stderr)
+  for name, entry in sorted(phases.items(), key=lambda item: -item[1]["seconds"]):
+    print("  %-14s %10.3f s %6d calls" % (name, entry["seconds"], entry["count"]),
+          file=sys.stderr)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# block vectorized reference implementations of refinement indicators for flagRegrid
+#
+# every indicator takes a level's cells, (N,) or (num_fields, N), and returns one value per
+# block of cells_per_block cells; flag_blocks() turns the values into the needsRefinement
+# and wantsCoarsening bits
+#
+import numpy as np
+
+def block_max_faces(face_values, cells_per_block):
+  # max over the cells_per_block + 1 faces of each block, the faces flagRegrid loops over
+  inner = face_values[:-1].reshape(-1, cells_per_block).max(axis=1)
+  return np.maximum(inner, face_values[cells_per_block::cells_per_block])
+
+def block_max_cells(cell_values, cells_per_block):
+  return cell_values.reshape(-1, cells_per_block).max(axis=1)
+
+def padded(cells, extrapolate=False):
+  # one ghost per side holding the end cell, so boundary differences are zero like
+  # calculateGradient, or linearly extrapolated so boundary second differences are zero
+  cells = np.atleast_2d(cells)
+  if not extrapolate:
+    return np.pad(cells, ((0, 0), (1, 1)), mode='edge')
+  return np.concatenate([2.0 * cells[:, :1] - cells[:, 1:2], cells,
+                         2.0 * cells[:, -1:] - cells[:, -2:-1]], axis=1)
+
+def gradient(cells, cells_per_block, dx):
+  # |d/dx| on faces, what calculateGradient and flagRegrid use with MAX_GRAD/MIN_GRAD
+  jumps = np.abs(np.diff(padded(cells), axis=1))[:, 1:-1] / dx
+  faces = np.concatenate([np.zeros((jumps.shape[0], 1)), jumps, np.zeros((jumps.shape[0], 1))],
+                         axis=1)
+  return block_max_faces(faces.max(axis=0), cells_per_block)
+
+def scaled_gradient(cells, cells_per_block, dx):
+  # jump across each face relative to the range of the field on the level, so a smooth ramp
+  # falls as dx shrinks while a discontinuity stays O(1)
+  cells = np.atleast_2d(cells)
+  scale = cells.max(axis=1) - cells.min(axis=1)
+  scale[scale == 0.0] = 1.0
+  return gradient(cells / scale[:, None], cells_per_block, 1.0)
+
+LOHNER_EPSILON = 0.01
+
+def lohner(cells, cells_per_block, dx):
+  # normalized second derivative, Lohner (1987), between 0 and 1 in each cell
+  u = padded(cells, extrapolate=True)
+  left = u[:, 1:-1] - u[:, :-2]
+  right = u[:, 2:] - u[:, 1:-1]
+  noise = np.abs(u[:, 2:]) + 2.0 * np.abs(u[:, 1:-1]) + np.abs(u[:, :-2])
+  denominator = np.abs(left) + np.abs(right) + LOHNER_EPSILON * noise
+  denominator[denominator == 0.0] = 1.0
+  E = np.abs(right - left) / denominator
+  return block_max_cells(E.max(axis=0), cells_per_block)
+
+def richardson(cells, cells_per_block, dx):
+  # difference between the cells and their restriction to the next coarser level interpolated
+  # back, relative to the range of the field: how much the block loses if it is coarsened.
+  # like flagRegrid it is block local, the coarse neighbors of a block are extrapolated, or
+  # held when the block has a single coarse cell
+  cells = np.atleast_2d(cells)
+  half = cells_per_block // 2
+  pairs = cells.reshape(cells.shape[0], -1, half, 2)
+  coarse = 0.5 * (pairs[..., 0] + pairs[..., 1])
+  if half == 1:
+    padded_coarse = np.concatenate([coarse, coarse, coarse], axis=2)
+  else:
+    padded_coarse = np.concatenate([2.0 * coarse[..., :1] - coarse[..., 1:2], coarse,
+                                    2.0 * coarse[..., -1:] - coarse[..., -2:-1]], axis=2)
+  # linear interpolation to the children at 1/4 and 3/4 of each coarse cell
+  prolonged = np.empty_like(pairs)
+  prolonged[..., 0] = 0.75 * padded_coarse[..., 1:-1] + 0.25 * padded_coarse[..., :-2]
+  prolonged[..., 1] = 0.75 * padded_coarse[..., 1:-1] + 0.25 * padded_coarse[..., 2:]
+  scale = cells.max(axis=1) - cells.min(axis=1)
+  scale[scale == 0.0] = 1.0
+  difference = np.abs(cells - prolonged.reshape(cells.shape)) / scale[:, None]
+  return block_max_cells(difference.max(axis=0), cells_per_block)
+
+INDICATORS = {"gradient": gradient,
+              "scaled_gradient": scaled_gradient,
+              "lohner": lohner,
+              "richardson": richardson}
+
+# (refine above, coarsen at or below), gradient matches MAX_GRAD and MIN_GRAD of linear_constants.rg
+THRESHOLDS = {"gradient": (1.0, 1.0e-4),
+              "scaled_gradient": (0.02, 0.002),
+              "lohner": (0.3, 0.05),
+              "richardson": (0.005, 0.0005)}
+
+def flag_blocks(indicator, cells, cells_per_block, dx, refine=None, coarsen=None):
+  # needsRefinement and wantsCoarsening of every block of the level
+  default_refine, default_coarsen = THRESHOLDS[indicator]
+  if refine is None:
+    refine = default_refine
+  if coarsen is None:
+    coarsen = default_coarsen
+  values = INDICATORS[indicator](cells, cells_per_block, dx)
+  return values > refine, values <= coarsen
@@ -25,9 +25,10 @@
 
 import numpy as np
 
-from euler import GAMMA, BETA, x, x_jump, t_final, P_l, rho_l, u_l, P_r, rho_r, u_r
+from euler import GAMMA, BETA, x_jump, t_final, P_l, rho_l, u_l, P_r, rho_r, u_r
 from euler import plot_density, plot_velocity, plot_pressure, plot_sie, plot_speed
 from euler import specific_internal_energy, get_energy
+from profiling import enable_from_argv, start_phase, stop_phase
 
 EPS = 1.0e-6
 
@@ -110,7 +111,10 @@ def verify_Rankine_Hugoniot(P_u, rho_u, v_u, P_d, rho_d, v_d, S):
     #print(rho_u*v_u - rho_d*v_d,"vs",S*(rho_u-rho_d))
 
 if __name__ == "__main__":
+    enable_from_argv()
+    start_phase("plot")
     import matplotlib.pyplot as plt
+    from euler import x
 
     P = np.arange(0.01, 2.0, 0.01)
 
@@ -135,7 +139,8 @@ if __name__ == "__main__":
         #f_func[i] = one(P[i], P_l, rho_l, u_l) - three(P[i], P_r, rho_r, u_r)
     #plt.plot(P,f_func)
 
-    # Newton solve
+    # Newton solve and sampling, the plot calls in between count as analytic time
+    start_phase("analytic")
     P_star = 0.5 * (P_l + P_r)
     u_l_star = one(P_star, P_l, rho_l, u_l)
     u_r_star = three(P_star, P_r, rho_r, u_r)
@@ -213,6 +218,7 @@ if __name__ == "__main__":
             velocity[i] = u_r
             pressure[i] = P_r
         sie[i] = specific_internal_energy(pressure[i], density[i])
+    stop_phase()
 
     plot_density(density)
     plot_velocity(velocity)
@@ -220,4 +226,5 @@ if __name__ == "__main__":
     plot_sie(sie)
     plot_speed(speed_of_sound(pressure,density))
 
+    stop_phase()
     plt.show()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# fixed grid output is written by every color of the cell partition as its own shard,
+# <model>.<NX>.<color>-of-<colors>.txt next to where <model>.<NX>.txt was written before, and
+# reassembled here in color order, by a pool of reader processes for large outputs
+#
+import numpy as np
+import os
+import re
+
+SHARD = re.compile(r"^(.+)\.(\d+)-of-(\d+)\.txt$")
+# below this many bytes of shards starting reader processes costs more than it saves
+PARALLEL_BYTES = 16 * 1024**2
+
+def shard_name(filename, color, num_colors):
+  # linear.80.txt -> linear.80.3-of-7.txt, as sprintf'd by writeCells
+  return filename[:-len(".txt")] + ".%d-of-%d.txt" % (color, num_colors)
+
+def shard_info(filename):
+  # (whole file name, color, colors) of a shard, None for other files
+  match = SHARD.match(os.path.basename(filename))
+  if match is None:
+    return None
+  return match.group(1) + ".txt", int(match.group(2)), int(match.group(3))
+
+def group_shards(filenames):
+  # whole file names in order of first appearance, shards replaced by the file they belong to
+  names = []
+  for filename in filenames:
+    info = shard_info(filename)
+    name = filename if info is None else os.path.join(os.path.dirname(filename), info[0])
+    if name not in names:
+      names.append(name)
+  return names
+
+def find_shards(filename):
+  # shard paths of filename in color order, the newest complete set if runs with different
+  # NUM_PARTITIONS left several, None without a complete set
+  directory = os.path.dirname(filename)
+  sets = {}
+  for entry in os.listdir(directory or "."):
+    info = shard_info(entry)
+    if info is not None and info[0] == os.path.basename(filename):
+      sets.setdefault(info[2], {})[info[1]] = os.path.join(directory, entry)
+  complete = [[shards[color] for color in range(colors)]
+              for colors, shards in sets.items() if len(shards) == colors]
+  if not complete:
+    return None
+  return max(complete, key=lambda paths: max([os.stat(path).st_mtime_ns for path in paths]))
+
+def read_rows(filename):
+  return np.loadtxt(filename, dtype=np.float64, ndmin=2)
+
+def cell_paths(filename):
+  # files read_cells reads for filename: its shards when they are newer than a whole file of the
+  # same name, else the file
+  paths = find_shards(filename)
+  if paths is None or (os.path.exists(filename) and os.stat(filename).st_mtime_ns
+                       > max([os.stat(path).st_mtime_ns for path in paths])):
+    paths = [filename]
+  # a color without cells writes an empty shard, which would load as (0, 1) whatever the columns
+  return [path for path in paths if os.stat(path).st_size > 0] or paths[:1]
+
+def parallel_read(paths):
+  return len(paths) > 1 and sum([os.stat(path).st_size for path in paths]) >= PARALLEL_BYTES
+
+def needs_pool(filenames):
+  # whether read_cells would use a pool for any of filenames, so callers start one only then
+  return any([parallel_read(cell_paths(filename)) for filename in filenames])
+
+def read_cells(filename, pool=None):
+  # (cells, columns) array of a writeCells output; the shards are read by the caller's
+  # multiprocessing pool when there is one and they hold at least PARALLEL_BYTES, otherwise in
+  # this process
+  paths = cell_paths(filename)
+  if len(paths) == 1:
+    return read_rows(paths[0])
+  if pool is not None and parallel_read(paths):
+    return np.concatenate(pool.map(read_rows, paths))
+  return np.concatenate([read_rows(path) for path in paths])
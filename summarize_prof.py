@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# per task cost tables from the tsv files legion_prof.py writes (make prof)
+#
+import numpy as np
+import argparse
+import csv
+import os
+import re
+import sys
+from profiling import enable_from_argv
+
+def task_name(title):
+  # "calculateAMRFlux [(3)] <1234>" -> "calculateAMRFlux"
+  title = re.sub(r"<\d+>", "", title)
+  title = re.sub(r"\[.*\]", "", title)
+  return title.strip()
+
+def processor_names(directory):
+  # legion_prof_processor.tsv maps each Proc_*.tsv to "Node 0 CPU 1" style names
+  names = {}
+  filename = os.path.join(directory, "legion_prof_processor.tsv")
+  if os.path.exists(filename):
+    with open(filename, "r") as f:
+      for row in csv.DictReader(f, delimiter="\t"):
+        names[os.path.basename(row["tsv"])] = row["full_text"]
+  return names
+
+def read_proc_tsv(filename, proc):
+  records = []
+  with open(filename, "r") as f:
+    for row in csv.DictReader(f, delimiter="\t"):
+      if not row.get("title") or not row.get("start") or not row.get("end"):
+        continue
+      records.append((proc, task_name(row["title"]), float(row["start"]), float(row["end"])))
+  return records
+
+def read_prof(directory):
+  # records of (processor, task, start, end) in microseconds
+  tsv_directory = os.path.join(directory, "tsv")
+  if not os.path.isdir(tsv_directory):
+    tsv_directory = directory
+  names = processor_names(tsv_directory)
+  records = []
+  for filename in sorted(os.listdir(tsv_directory)):
+    if filename.startswith("Proc_") and filename.endswith(".tsv"):
+      proc = names.get(filename, filename[:-len(".tsv")])
+      records += read_proc_tsv(os.path.join(tsv_directory, filename), proc)
+  return records
+
+def summarize(records):
+  durations = {}
+  for proc, task, start, end in records:
+    durations.setdefault(task, []).append(end - start)
+  summary = {}
+  for task, values in durations.items():
+    values = np.array(values)
+    summary[task] = {"count": len(values),
+                     "total": np.sum(values),
+                     "mean": np.mean(values),
+                     "p95": np.percentile(values, 95)}
+  return summary
+
+def utilization(records):
+  # busy fraction of each processor between the first start and last end of the run
+  if len(records) == 0:
+    return {}
+  run_start = min(record[2] for record in records)
+  run_end = max(record[3] for record in records)
+  intervals = {}
+  for proc, task, start, end in records:
+    intervals.setdefault(proc, []).append((start, end))
+  busy = {}
+  for proc, spans in intervals.items():
+    total = 0.0
+    current_start, current_end = None, None
+    for start, end in sorted(spans):
+      if current_end is None or start > current_end:
+        if current_end is not None:
+          total += current_end - current_start
+        current_start, current_end = start, end
+      else:
+        current_end = max(current_end, end)
+    total += current_end - current_start
+    busy[proc] = total / (run_end - run_start) if run_end > run_start else 0.0
+  return busy
+
+def compare(old, new, tolerance):
+  # tasks whose total or mean time grew by more than tolerance, as a fraction
+  regressions = []
+  for task in sorted(new):
+    if task not in old:
+      continue
+    for key in ["total", "mean"]:
+      if old[task][key] > 0.0 and new[task][key] > (1.0 + tolerance) * old[task][key]:
+        regressions.append((task, key, old[task][key], new[task][key]))
+  return regressions
+
+def print_summary(summary, busy):
+  print("%-24s %8s %14s %12s %12s" % ("task", "count", "total (us)", "mean (us)", "p95 (us)"))
+  for task in sorted(summary, key=lambda task: -summary[task]["total"]):
+    entry = summary[task]
+    print("%-24s %8d %14.1f %12.2f %12.2f" % (task, entry["count"], entry["total"], entry["mean"],
+                                              entry["p95"]))
+  print("")
+  print("%-24s %12s" % ("processor", "utilization"))
+  for proc in sorted(busy):
+    print("%-24s %11.1f%%" % (proc, 100.0 * busy[proc]))
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Per task cost tables from legion_prof.py output.')
+  parser.add_argument('prof_dirs',nargs='+',help='legion_prof.py output, a second one to compare')
+  parser.add_argument('--tolerance',type=float,default=0.1,
+                      help='fractional growth of a task total or mean to flag as a regression')
+  args = parser.parse_args()
+
+  records = read_prof(args.prof_dirs[-1])
+  summary = summarize(records)
+  print_summary(summary, utilization(records))
+
+  if len(args.prof_dirs) > 1:
+    old = summarize(read_prof(args.prof_dirs[0]))
+    regressions = compare(old, summary, args.tolerance)
+    print("")
+    for task, key, before, after in regressions:
+      print("%s %s: \033[0;31mREGRESSION\033[0m %.2f -> %.2f us" % (task, key, before, after))
+    if len(regressions) == 0:
+      print("no regressions against " + args.prof_dirs[0])
+    sys.exit(len(regressions) > 0)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import os
+import sys
+import tempfile
+from analyze_diagnostics import read_diagnostics, conserved_fields, drift, first_bad_step
+from checks import check
+from profiling import enable_from_argv
+
+ROWS = ["# step time density_total density_min density_max density_nans energy_total energy_min energy_max energy_nans",
+        "0 0 0.5625 0.125 1 0 1.375 0.25 2.5 0",
+        "1 0.1 0.5625 0.125 1 0 1.38875 0.25 2.5 0",
+        "2 0.2 nan 0.125 1 3 1.375 0.25 2.5 0",
+        "3 0.3 0.5625 0.125"]
+
+def test_read():
+  ERROR = 0
+  with tempfile.TemporaryDirectory() as directory:
+    filename = os.path.join(directory, "diagnostics.80.txt")
+    with open(filename, "w") as f:
+      f.write("\n".join(ROWS) + "\n")
+    columns = read_diagnostics(filename)
+  # the truncated last row is dropped
+  ERROR += check(len(columns["step"]), 3, "rows")
+  ERROR += check(conserved_fields(columns), ["density", "energy"], "fields")
+  ERROR += check(drift(columns, "energy")[1], 0.01, "energy drift", rtol=1.0e-12)
+  ERROR += check(drift(columns, "density")[1], 0.0, "density drift", rtol=1.0e-12)
+  ERROR += check(first_bad_step(columns), 2, "first bad step")
+  healthy = {name: values[:2] for name, values in columns.items()}
+  ERROR += check(first_bad_step(healthy) is None, True, "healthy run")
+  return ERROR
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  ERROR = test_read()
+  sys.exit(ERROR)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import os
+import sys
+import tempfile
+from autotune import (candidates, tune, cache_key, machine_signature, problem_signature,
+                      read_cache, block_size_choices, solver_command)
+from plan_resolution import read_global_const, write_global_const
+from checks import check
+from profiling import enable_from_argv
+
+# stand-in for the solver: reads global_const.rg like the Regent drivers and, without running,
+# reports 2 s of startup plus a per step cost lowest for 4 partitions, 8 cells per block, 4 cpus;
+# it fails for 3 partitions
+STAND_IN = """
+import math, sys
+constants = {}
+for line in open("global_const.rg"):
+  line = line.split("--")[0]
+  if "=" in line:
+    name, value = [entry.strip() for entry in line.split("=", 1)]
+    constants[name] = value
+if constants["NUM_PARTITIONS"] == "3":
+  sys.exit(1)
+cpus = int(sys.argv[sys.argv.index("-ll:cpu") + 1])
+steps = round(float(constants["T_FINAL"]) / (0.5 / 640) - 0.5)
+cost = (1.0 + (int(constants["NUM_PARTITIONS"]) - 4)**2
+        + (math.log2(int(constants["CELLS_PER_BLOCK_X"])) - 3)**2 + 0.1 * (cpus - 4)**2)
+print("autotune_seconds", 2.0 + steps * cost)
+"""
+
+def problem(directory):
+  constants = {"CELLS_PER_BLOCK_X": 2, "LEVEL_1_BLOCKS_X": 32, "MAX_REFINEMENT_LEVEL": 1,
+               "NUM_PARTITIONS": 1, "T_FINAL": 0.25, "LENGTH_X": 1.0}
+  with open(os.path.join(directory, "global_const.rg"), "w") as f:
+    write_global_const(f, constants)
+  with open(os.path.join(directory, "stand_in.py"), "w") as f:
+    f.write(STAND_IN)
+  return constants
+
+def test_candidates():
+  ERROR = 0
+  constants = {"CELLS_PER_BLOCK_X": 2, "LEVEL_1_BLOCKS_X": 6, "MAX_REFINEMENT_LEVEL": 2}
+  configs = candidates(constants, [1, 4, 16], [2, 3, 4, 8], [1])
+  ERROR += check(sorted(set([config["CELLS_PER_BLOCK_X"] for config in configs])), [2, 4],
+                 "block sizes dividing NX")
+  ERROR += check(all([config["CELLS_PER_BLOCK_X"] * config["LEVEL_1_BLOCKS_X"] == 12
+                      for config in configs]), True, "level 1 cells kept")
+  ERROR += check(max([config["NUM_PARTITIONS"] for config in configs]), 4,
+                 "partitions no more than blocks")
+  # the block layout decides where an AMR driver refines, so it is kept and keyed
+  ERROR += check(block_size_choices("1d_fix.rg", constants, [2, 4, 8]), [2, 4, 8],
+                 "fixed grid block sizes")
+  ERROR += check(block_size_choices("1d_amr.rg", constants, [2, 4, 8]), [2], "AMR block size kept")
+  configs = candidates(constants, [1, 4], block_size_choices("1d_amr.rg", constants, [2, 4]), [1])
+  ERROR += check(set([(config["CELLS_PER_BLOCK_X"], config["LEVEL_1_BLOCKS_X"])
+                      for config in configs]), set([(2, 6)]), "AMR layout kept")
+  other = dict(constants, CELLS_PER_BLOCK_X=4, LEVEL_1_BLOCKS_X=3)
+  ERROR += check(problem_signature("1d_fix.rg", "linear", constants)
+                 == problem_signature("1d_fix.rg", "linear", other), True, "fixed grid key")
+  ERROR += check(problem_signature("1d_amr.rg", "linear", constants)
+                 == problem_signature("1d_amr.rg", "linear", other), False, "AMR key has layout")
+  ERROR += check(solver_command("regent.py {driver} -ll:cpu {cpus}", "1d_amr.rg", 4),
+                 "regent.py 1d_amr.rg -ll:cpu 4", "command line")
+  return ERROR
+
+def test_tune():
+  ERROR = 0
+  with tempfile.TemporaryDirectory() as directory:
+    constants = problem(directory)
+    global_const = os.path.join(directory, "global_const.rg")
+    cache_file = os.path.join(directory, "autotune.json")
+    command = sys.executable + " stand_in.py {driver} -ll:cpu {cpus}"
+    configs = candidates(constants, [1, 2, 3, 4, 8], [2, 4, 8, 16], [1, 2, 4])
+    best, results = tune(command, "1d_fix.rg", "linear", constants, configs, cache_file,
+                         global_const=global_const)
+    ERROR += check((best["NUM_PARTITIONS"], best["CELLS_PER_BLOCK_X"], best["cpus"]), (4, 8, 4),
+                   "fastest configuration")
+    ERROR += check(abs(best["seconds_per_step"] - 1.0) < 1.0e-9, True,
+                   "startup cancelled in seconds per step")
+    ERROR += check(len(results), len(configs), "all configurations calibrated")
+    ERROR += check(set([config["NUM_PARTITIONS"] for seconds, config in results if seconds is None]),
+                   set([3]), "failed configurations recorded")
+    ERROR += check(read_global_const(global_const), constants, "global_const.rg restored")
+    key = " | ".join([machine_signature(), command,
+                      problem_signature("1d_fix.rg", "linear", constants)])
+    ERROR += check(cache_key(command, "1d_fix.rg", "linear", constants), key, "cache key")
+    ERROR += check(read_cache(cache_file).get(key), best, "choice cached")
+    # a cached choice is returned without running the command
+    best, results = tune(command, "1d_fix.rg", "linear", constants, configs, cache_file,
+                         global_const=global_const)
+    ERROR += check((results, best["NUM_PARTITIONS"]), (None, 4), "cache hit")
+    # another solver command is tuned on its own, here every run fails and nothing is cached
+    best, results = tune("false", "1d_fix.rg", "linear", constants, configs, cache_file,
+                         global_const=global_const)
+    ERROR += check((best, len(results)), (None, len(configs)), "other command tuned again")
+    ERROR += check(cache_key("false", "1d_fix.rg", "linear", constants) in read_cache(cache_file),
+                   False, "failed tuning not cached")
+    constants["PRECISION"] = "single"
+    best, results = tune(command, "1d_fix.rg", "linear", constants, configs, cache_file,
+                         global_const=global_const)
+    ERROR += check(results is not None, True, "new problem tuned again")
+  return ERROR
+
+def main():
+  enable_from_argv()
+  ERROR = 0
+  ERROR += test_candidates()
+  ERROR += test_tune()
+  return ERROR
+
+if __name__== "__main__":
+  sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import numpy as np
+import os
+import sys
+import tempfile
+from ensemble import read_parameters, solve_ensemble, member_name, compare_members
+from euler import GAMMA
+from parallel_solver import MODELS, solve, num_steps
+from shards import shard_name
+from checks import check
+from profiling import enable_from_argv
+
+def test_members(model, header, rows, nx, t_final):
+  # every member matches its standalone run bit for bit
+  ERROR = 0
+  with tempfile.TemporaryDirectory() as directory:
+    filename = os.path.join(directory, "members.txt")
+    with open(filename, "w") as f:
+      f.write(header + "\n" + "\n".join(rows) + "\n")
+    members = read_parameters(filename, model)
+  state = solve_ensemble(model, nx, members, t_final)
+  for member, params in enumerate(members):
+    alone = solve(model, nx, 1, 1, t_final, params)
+    descriptor = "%s member %d %s bitwise identical to standalone run" % (model, member,
+                                                                          rows[member])
+    ERROR += check(state[:, member, :].tobytes() == alone.tobytes(), True, descriptor)
+  return ERROR
+
+def test_compare(model, header, rows, nx, t_final):
+  # member shards as 1d_fix.rg writes them with ENSEMBLE, one wrong digit is caught
+  ERROR = 0
+  with tempfile.TemporaryDirectory() as directory:
+    filename = os.path.join(directory, "members.txt")
+    with open(filename, "w") as f:
+      f.write(header + "\n" + "\n".join(rows) + "\n")
+    state = solve_ensemble(model, nx, read_parameters(filename, model), t_final)
+    for member in range(state.shape[1]):
+      whole = os.path.join(directory, member_name(model, nx, member))
+      for color, cells in enumerate(np.array_split(np.arange(nx), 3)):
+        with open(shard_name(whole, color, 3), "w") as f:
+          for cell in cells:
+            f.write(" ".join(["%.17g" % value for value in state[:, member, cell]]) + "\n")
+    ERROR += check(compare_members(model, state, directory), [], model + " 1d_fix.rg members")
+    state[0, 1, nx // 2] = np.nextafter(state[0, 1, nx // 2], 2.0)
+    ERROR += check(compare_members(model, state, directory), [1], model + " member 1 differs")
+  return ERROR
+
+def regent_euler(nx, params, t_final):
+  # initializeCells, calculateFlux and applyFlux of euler.rg transcribed cell by cell in Python
+  # floats, which round like the double arithmetic of the tasks
+  dx = 1.0 / nx
+  dt = MODELS["euler"]["dt"]
+  rho, v, rhov, P, E = [], [], [], [], []
+  for cell in range(nx):
+    side = "L" if cell < nx // 2 else "R"
+    rho.append(params["RHO_" + side])
+    v.append(params["V_" + side])
+    rhov.append(rho[-1] * v[-1])
+    P.append(params["P_" + side])
+    E.append(P[-1] / (GAMMA - 1.0) + 0.5 * rho[-1] * (v[-1] * v[-1]))
+  for step in range(num_steps(dt, t_final)):
+    density_flux = [0.0] * (nx + 1)
+    momentum_flux = [0.0] * (nx + 1)
+    energy_flux = [0.0] * (nx + 1)
+    for face in range(1, nx):
+      l, r = face - 1, face
+      density_flux[face] = 0.5 * (rhov[l] + rhov[r]) + 0.5 * dx * (rho[l] - rho[r])/dt
+      momentum_flux[face] = (0.5 * (rhov[l] * v[l] + P[l] + rhov[r] * v[r] + P[r])
+                             + 0.5 * dx * (rhov[l] - rhov[r])/dt)
+      energy_flux[face] = (0.5 * (v[l] * (P[l] + E[l]) + v[r] * (P[r] + E[r]))
+                           + 0.5 * dx * (E[l] - E[r])/dt)
+    for flux in [density_flux, momentum_flux, energy_flux]:
+      flux[0] = flux[1]
+      flux[nx] = flux[nx - 1]
+    for cell in range(nx):
+      rho[cell] = rho[cell] - dt * (density_flux[cell + 1] - density_flux[cell]) / dx
+      rhov[cell] = rhov[cell] - dt * (momentum_flux[cell + 1] - momentum_flux[cell]) / dx
+      E[cell] = E[cell] - dt * (energy_flux[cell + 1] - energy_flux[cell]) / dx
+      v[cell] = rhov[cell] / rho[cell]
+      P[cell] = (E[cell] - 0.5 * rhov[cell] * v[cell]) * (GAMMA - 1.0)
+  return np.array([rho, rhov, E])
+
+def test_regent_order(header, rows, nx, t_final):
+  # the Python reference rounds like euler.rg, so a correct 1d_fix.rg run compares equal
+  ERROR = 0
+  with tempfile.TemporaryDirectory() as directory:
+    filename = os.path.join(directory, "members.txt")
+    with open(filename, "w") as f:
+      f.write(header + "\n" + "\n".join(rows) + "\n")
+    members = read_parameters(filename, "euler")
+  state = solve_ensemble("euler", nx, members, t_final)
+  for member, params in enumerate(members):
+    regent = regent_euler(nx, params, t_final)
+    ERROR += check(state[:, member, :].tobytes() == regent.tobytes(), True,
+                   "euler member %d %s bitwise identical to euler.rg arithmetic" % (member,
+                                                                                  rows[member]))
+    ERROR += check(solve("euler", nx // 5, 5, 3, t_final, params).tobytes() == regent.tobytes(),
+                   True, "euler 3 partitions of member %d identical to euler.rg arithmetic" % member)
+  return ERROR
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  ERROR = test_members("linear", "# U", ["1.0", "0.5", "2.0"], 40, 0.25)
+  ERROR += test_members("euler", "# P_L RHO_L P_R RHO_R", ["1.0 1.0 0.1 0.125", "2.0 1.5 0.1 0.2",
+                                                           "0.5 0.8 0.2 0.3"], 50, 0.05)
+  ERROR += test_compare("linear", "# U", ["1.0", "0.5"], 40, 0.25)
+  ERROR += test_compare("euler", "# P_L RHO_L", ["1.0 1.0", "2.0 1.5"], 50, 0.05)
+  ERROR += test_regent_order("# P_L RHO_L V_L P_R RHO_R V_R", ["1.0 1.0 0.0 0.1 0.125 0.0",
+                                                              "2.0 1.5 0.3 0.1 0.2 -0.1"], 50, 0.05)
+  sys.exit(ERROR)
@@ -22,16 +22,20 @@
 # 
 # If software is modified to produce derivative works, such modified software should be
 # clearly marked, so as not to confuse it with the version available from LANL.
+import argparse
 import numpy as np
 import os
 import subprocess
 import sys
-from analyze_linear import measure_error
+import time
+from analyze_linear import measure_error, PRECISIONS
+from checks import compare_precision
+from profiling import phase, enable_from_argv
 
 legion_root = os.environ.get('LEGION_ROOT', '../../github/legion')
 regent = os.path.join(legion_root, 'language/regent.py')
 
-def set_refinement_level(refinement_level):
+def set_refinement_level(refinement_level, precision="double"):
   with open("global_const.rg","w") as f:
     f.write("-- required global constants\n")
     f.write("CELLS_PER_BLOCK_X = 2 -- must be multiple of 2\n")
@@ -40,25 +44,43 @@ def set_refinement_level(refinement_level):
     f.write("NUM_PARTITIONS = 7\n")
     f.write("T_FINAL = 0.25\n")
     f.write("LENGTH_X = 1.0\n")
+    f.write("PRECISION = \"" + precision + "\"\n")
     f.close()
 
-def test_single_resolution(refinement_level, filename, threshold, descriptor):
-  ERROR = 0
+def run_single_resolution(refinement_level, filename, precision="double"):
   with open("/dev/null","w") as dev_null:
+    set_refinement_level(refinement_level, precision)
+    start = time.time()
+    with phase("solver_launch"):
+      subprocess.check_call([regent,"1d_fix.rg"], stdout=dev_null)
+    seconds = time.time() - start
+  L2, x, numeric, analytic = measure_error(filename, PRECISIONS[precision])
+  return L2, seconds
 
-    set_refinement_level(refinement_level)
-    subprocess.check_call([regent,"1d_fix.rg"], stdout=dev_null)
-    L2, x, numeric, analytic = measure_error(filename)
-    if (L2 > threshold) or np.isnan(L2) :
-      print(descriptor+": \033[0;31mFAIL\033[0m ",L2," > ",threshold)
-      ERROR = 1
-    else:
-      print(descriptor+": \033[0;32mPASS\033[0m ",L2," < ",threshold)
+def test_single_resolution(refinement_level, filename, threshold, descriptor, precision="double"):
+  ERROR = 0
+  L2, seconds = run_single_resolution(refinement_level, filename, precision)
+  if (L2 > threshold) or np.isnan(L2) :
+    print(descriptor+": \033[0;31mFAIL\033[0m ",L2," > ",threshold)
+    ERROR = 1
+  else:
+    print(descriptor+": \033[0;32mPASS\033[0m ",L2," < ",threshold)
   return ERROR
 
 if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Convergence test for fixed grid linear advection.')
+  parser.add_argument('--compare-precision',action='store_true',
+                      help='run every resolution in double and single PRECISION and compare')
+  args = parser.parse_args()
 
   subprocess.check_call(["ln","-sf","linear_advection.rg","model.rg"])
 
+  if args.compare_precision:
+    sys.exit(compare_precision(run_single_resolution,
+                               [(4, "linear.80.txt", 0.0487396, "Linear fixed NX=80"),
+                                (5, "linear.160.txt", 0.0259696, "Linear fixed NX=160")]))
+
   sys.exit(test_single_resolution(4, "linear.80.txt", 0.0487396, "Linear fixed NX=80") + test_single_resolution(5, "linear.160.txt", 0.0259696, "Linear fixed NX=160"))
 
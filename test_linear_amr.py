@@ -29,6 +29,7 @@ import sys
 from analyze_linear import trapezoid
 from analyze_amr_linear import read_amr
 from test_linear import set_refinement_level
+from profiling import phase, enable_from_argv
 
 legion_root = os.environ.get('LEGION_ROOT', '../../github/legion')
 regent = os.path.join(legion_root, 'language/regent.py')
@@ -49,13 +50,15 @@ def test_amr(refinement_level, filenames, threshold, descriptor):
   with open("/dev/null","w") as dev_null:
 
     set_refinement_level(refinement_level)
-    subprocess.check_call([regent,'1d_amr.rg','-ll:cpu','2'], stdout=dev_null)
+    with phase("solver_launch"):
+      subprocess.check_call([regent,'1d_amr.rg','-ll:cpu','2'], stdout=dev_null)
 
     x, numeric = read_amr(filenames)
-    x = np.array(x)
-    analytic = np.zeros(len(x))
-    analytic[np.where(np.array(x)<0.75)] = 1.0
-    L2 = trapezoid(x, (numeric - analytic)**2)
+    with phase("analytic"):
+      x = np.array(x)
+      analytic = np.zeros(len(x))
+      analytic[np.where(np.array(x)<0.75)] = 1.0
+      L2 = trapezoid(x, (numeric - analytic)**2)
  
     if (L2 > threshold) or np.isnan(L2) :
       print(descriptor+": \033[0;31mFAIL\033[0m ",L2," > ",threshold)
@@ -65,20 +68,23 @@ def test_amr(refinement_level, filenames, threshold, descriptor):
   return ERROR
 
 if __name__== "__main__":
+  enable_from_argv()
 
   subprocess.check_call(["ln","-sf","linear_advection.rg","model.rg"])
   subprocess.check_call(["ln","-sf","linear_advection_amr.rg","model_amr.rg"])
 
   set_cells_per_block_x(0)
   with open("/dev/null","w") as dev_null:
-    ERROR = subprocess.call([regent,"1d_amr.rg"], stdout=dev_null)
+    with phase("solver_launch"):
+      ERROR = subprocess.call([regent,"1d_amr.rg"], stdout=dev_null)
   if ERROR == 0:
     print("1d_amr CELLS_PER_BLOCK_X: \033[0;31mFAIL\033[0m")
     sys.exit(1)
 
   set_cells_per_block_x(3)
   with open("/dev/null","w") as dev_null:
-    ERROR = subprocess.call([regent,"1d_amr.rg"], stdout=dev_null)
+    with phase("solver_launch"):
+      ERROR = subprocess.call([regent,"1d_amr.rg"], stdout=dev_null)
   if ERROR == 0:
     print("1d_amr CELLS_PER_BLOCK_X: \033[0;31mFAIL\033[0m")
     sys.exit(1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import multiprocessing
+import sys
+from multiprocessing import shared_memory
+from parallel_solver import solve, color_cells, exchanges, worker
+from checks import check
+from profiling import enable_from_argv
+
+def test_color_cells():
+  return check(color_cells(10, 2, 3), [(0, 7), (8, 13), (14, 19)], "color_cells uneven split")
+
+def test_bitwise(model, num_blocks, cells_per_block, t_final):
+  ERROR = 0
+  serial = solve(model, num_blocks, cells_per_block, 1, t_final)
+  for num_partitions in [2, 3, 7]:
+    parallel = solve(model, num_blocks, cells_per_block, num_partitions, t_final)
+    descriptor = model + " " + str(num_partitions) + " partitions bitwise identical to 1 partition"
+    ERROR += check(parallel.tobytes() == serial.tobytes(), True, descriptor)
+  return ERROR
+
+def test_halo(model, num_blocks, cells_per_block, t_final):
+  # HALO_DEPTH steps per ghost exchange against an exchange every step
+  ERROR = 0
+  for num_partitions in [3, 7]:
+    single = solve(model, num_blocks, cells_per_block, num_partitions, t_final)
+    for halo_depth in [2, 3, 5]:
+      deep = solve(model, num_blocks, cells_per_block, num_partitions, t_final,
+                   halo_depth=halo_depth)
+      descriptor = "%s %d partitions halo depth %d bitwise identical to halo depth 1" % (
+        model, num_partitions, halo_depth)
+      ERROR += check(deep.tobytes() == single.tobytes(), True, descriptor)
+  ERROR += check((exchanges(16, 5), exchanges(15, 5)), (4, 3), "exchange rounds")
+  return ERROR
+
+def test_failed_worker():
+  # a color that raises breaks the barrier so the others exit instead of waiting forever
+  ERROR = 0
+  shape = (1, 8)
+  shm = shared_memory.SharedMemory(create=True, size=8 * shape[1])
+  try:
+    barrier = multiprocessing.Barrier(2)
+    other = multiprocessing.Process(target=worker, args=("linear", shm.name, shape, 4, 7, 0.125,
+                                                         0.01, 3, barrier, None))
+    other.start()
+    try:
+      worker("unknown", shm.name, shape, 0, 3, 0.125, 0.01, 3, barrier, None)
+    except KeyError:
+      pass
+    other.join(30)
+    ERROR += check(other.exitcode not in (0, None), True, "other color exits")
+    if other.is_alive():
+      other.terminate()
+  finally:
+    shm.close()
+    shm.unlink()
+  return ERROR
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  sys.exit(test_color_cells() + test_failed_worker() + test_bitwise("linear", 20, 2, 0.05) + test_bitwise("euler", 20, 5, 0.02)
+           + test_halo("linear", 20, 2, 0.05) + test_halo("euler", 20, 5, 0.02))
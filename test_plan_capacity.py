@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import sys
+from plan_capacity import read_fspaces, fspace_bytes, level_regions, ghost_exchange_bytes, index_launches
+from plan_resolution import read_global_const
+from checks import check
+from profiling import enable_from_argv
+
+# 2 levels of 3 and 6 blocks of 2 cells on 2 partitions, counted by hand from make_level_regions
+SMALL = {"CELLS_PER_BLOCK_X": 2, "LEVEL_1_BLOCKS_X": 3, "MAX_REFINEMENT_LEVEL": 2,
+         "NUM_PARTITIONS": 2}
+
+def test_fspaces():
+  ERROR = 0
+  linear = read_fspaces("linear_constants.rg")
+  ERROR += check(fspace_bytes(linear["CellValues"]), 16, "linear CellValues bytes")
+  ERROR += check(fspace_bytes(linear["FaceValues"]), 16, "linear FaceValues bytes")
+  ERROR += check(fspace_bytes(read_fspaces("refinement_bits.rg")["RefinementBits"]), 9,
+                 "RefinementBits bytes")
+  # make_cell_values only adds the _copy fields of the HALO_FIELDS with HALO_DEPTH > 1
+  ERROR += check(fspace_bytes(read_fspaces("euler.rg")["CellValues"]), 40, "euler CellValues bytes")
+  ERROR += check(fspace_bytes(read_fspaces("euler.rg", "single", 3)["CellValues"]), 40,
+                 "euler single CellValues bytes with HALO_DEPTH 3")
+  return ERROR
+
+def test_regions():
+  ERROR = 0
+  rows = level_regions(SMALL, 16, 16, 9)
+  ERROR += check(rows, [(1, "cells", 6, 96), (1, "faces", 8, 128), (1, "meta", 3, 27),
+                        (1, "bloated cell ghosts", 2, 32), (1, "bloated meta ghosts", 2, 18),
+                        (2, "cells", 12, 192), (2, "faces", 14, 224), (2, "meta", 6, 54),
+                        (2, "bloated cell ghosts", 2, 32), (2, "bloated meta ghosts", 2, 18),
+                        (2, "bloated by parent ghosts", 2, 50)], "regions per level")
+  rows = level_regions(SMALL, 16, 16, 9, 3)
+  ERROR += check([row[2] for row in rows if row[1] == "bloated cell ghosts"], [6, 6],
+                 "HALO_DEPTH 3 cell ghosts")
+  return ERROR
+
+def test_exchange_and_launches():
+  ERROR = 0
+  # flux reads 2 ghosts at both levels and 2 by parent, interpolation 2 by parent twice
+  ERROR += check(ghost_exchange_bytes(SMALL, 16), 160, "AMR ghost exchange bytes")
+  ERROR += check(ghost_exchange_bytes(dict(SMALL, HALO_DEPTH=3), 8, "1d_fix.rg"), 48,
+                 "1d_fix.rg ghost exchange bytes with HALO_DEPTH 3")
+  ERROR += check(index_launches(SMALL), {"time_step": 7, "flag_regrid": 4, "do_regrid": 4},
+                 "small config launches")
+  default = read_global_const("global_const.rg")
+  ERROR += check(index_launches(default), {"time_step": 15, "flag_regrid": 8, "do_regrid": 18},
+                 "default config launches")
+  ERROR += check(index_launches(dict(SMALL, HALO_DEPTH=1), "1d_fix.rg"), {"time_step": 2},
+                 "1d_fix.rg launches")
+  ERROR += check(index_launches(dict(SMALL, HALO_DEPTH=3), "1d_fix.rg"), {"time_step": 1},
+                 "1d_fix.rg launches with HALO_DEPTH 3")
+  return ERROR
+
+def main():
+  enable_from_argv()
+  ERROR = 0
+  ERROR += test_fspaces()
+  ERROR += test_regions()
+  ERROR += test_exchange_and_launches()
+  return ERROR
+
+if __name__== "__main__":
+  sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import numpy as np
+import os
+import sys
+import tempfile
+import analyze_linear
+from plan_resolution import (MODELS, num_steps, plan, read_global_const, write_global_const,
+                             update_global_const, default_t_final, measure_history)
+from checks import check
+from profiling import enable_from_argv
+
+def test_steps():
+  ERROR = 0
+  dt = MODELS["linear"]["dt"]
+  ERROR += check(num_steps("linear", 7.5 * dt), 7, "steps of the 1d_fix.rg loop")
+  return ERROR
+
+def test_plan():
+  ERROR = 0
+  # first order history, L2 = 4 / NX
+  NX = [80, 160, 320]
+  L2 = [4.0 / nx for nx in NX]
+  cost, level, cells, blocks, nx, error = plan("linear", NX, L2, 0.01251, 0.25)
+  ERROR += check(nx, 320, "cheapest NX meeting the target")
+  ERROR += check(cost, 320 * num_steps("linear", 0.25), "cost in cell steps")
+  # among equal cell steps the fewest declared cells and blocks
+  ERROR += check((level, cells, blocks), (1, 64, 5), "least total work")
+  ERROR += check(plan("linear", NX, L2, 4.0 / 1280, 0.25), None, "no NX past MAX_NX")
+  return ERROR
+
+def test_global_const():
+  ERROR = 0
+  constants = {"CELLS_PER_BLOCK_X": 4, "T_FINAL": 0.25, "PRECISION": "single", "PREVIEW": True,
+               "HALO_DEPTH": 2}
+  with tempfile.TemporaryDirectory() as directory:
+    filename = os.path.join(directory, "global_const.rg")
+    for preview in [True, False]:
+      constants["PREVIEW"] = preview
+      with open(filename, "w") as f:
+        write_global_const(f, constants)
+      ERROR += check(read_global_const(filename), constants,
+                     "global_const.rg round trip with PREVIEW = %s" % str(preview).lower())
+    with open(filename, "r") as f:
+      ERROR += check("PREVIEW = false\n" in f.read(), True, "Lua boolean written")
+    # updating keeps the other lines and the comments
+    with open(filename, "w") as f:
+      f.write("-- problem\nNUM_PARTITIONS = 1 -- tuned\nLENGTH_X = -1.0\n")
+    update_global_const(filename, {"NUM_PARTITIONS": 4, "LENGTH_X": 2.0, "HALO_DEPTH": 2})
+    with open(filename, "r") as f:
+      ERROR += check(f.read(), "-- problem\nNUM_PARTITIONS = 4 -- tuned\nLENGTH_X = 2.0\n"
+                     "HALO_DEPTH = 2\n", "global_const.rg updated in place")
+  return ERROR
+
+def test_defaults():
+  ERROR = 0
+  ERROR += check(default_t_final("euler", {"T_FINAL": 0.1}), 0.1, "configured T_FINAL kept")
+  ERROR += check(default_t_final("euler", {}), MODELS["euler"]["t_final"], "model T_FINAL")
+  with tempfile.TemporaryDirectory() as directory:
+    filename = os.path.join(directory, "linear.80.txt")
+    with open(filename, "w") as f:
+      for cell in range(80):
+        f.write("%.9g\n" % np.float32(1.0 / 3.0 if cell < 60 else 0.1))
+    ERROR += check(measure_history("linear", [filename], np.float32)[1][0],
+                   analyze_linear.measure_error(filename, np.float32)[0], "history in PRECISION")
+  return ERROR
+
+def main():
+  enable_from_argv()
+  ERROR = 0
+  ERROR += test_steps()
+  ERROR += test_plan()
+  ERROR += test_global_const()
+  ERROR += test_defaults()
+  return ERROR
+
+if __name__== "__main__":
+  sys.exit(main())
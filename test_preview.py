@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import numpy as np
+import os
+import sys
+import tempfile
+from preview import bin_cells, write_preview, read_preview, select_lod, lod_points, LOD_BINS
+from checks import check
+from profiling import enable_from_argv
+
+def amr_cells():
+  # cells of three levels, like the linear_amr output of one run
+  x = np.concatenate([(np.arange(0, 20) + 0.5) / 40.0, (np.arange(40, 70) + 0.5) / 80.0,
+                      (np.arange(140, 160) + 0.5) / 160.0])
+  values = np.sin(7.0 * x) + (x < 0.75)
+  return x, values
+
+def test_binning():
+  ERROR = 0
+  x, values = amr_cells()
+  bins = 16
+  count, minimum, maximum, mean = bin_cells(x, values, bins)
+  index = (x * bins).astype(int)
+  expected = [values[index == bin] for bin in range(bins)]
+  ERROR += check(count, [len(cells) for cells in expected], "bin counts")
+  ERROR += check(minimum, [cells.min() if len(cells) else np.nan for cells in expected],
+                 "bin min", rtol=1.0e-12)
+  ERROR += check(maximum, [cells.max() if len(cells) else np.nan for cells in expected],
+                 "bin max", rtol=1.0e-12)
+  ERROR += check(mean, [cells.mean() if len(cells) else np.nan for cells in expected],
+                 "bin mean", rtol=1.0e-12)
+  return ERROR
+
+def test_partitions():
+  # previews of the partition files merge into the preview of all cells
+  ERROR = 0
+  x, values = amr_cells()
+  with tempfile.TemporaryDirectory() as directory:
+    filenames = []
+    for piece, cells in enumerate(np.array_split(np.arange(len(x)), 4)):
+      filename = os.path.join(directory, "linear_amr.80.%d.txt" % piece)
+      write_preview(filename, x[cells], values[cells])
+      filenames.append(filename)
+    lod = read_preview(filenames)
+    ERROR += check(sorted(lod), LOD_BINS, "levels of detail")
+    for bins in LOD_BINS:
+      for name, merged, whole in zip(["count", "min", "max", "mean"], lod[bins],
+                                     bin_cells(x, values, bins)):
+        ERROR += check(merged, whole, "merged %s %d bins" % (name, bins), rtol=1.0e-12)
+    ERROR += check(read_preview(filenames + [os.path.join(directory, "linear.80.txt")]) is None,
+                   True, "missing preview")
+    centers, minimum, maximum, mean = lod_points(lod, 256)
+    ERROR += check(len(centers), np.count_nonzero(lod[256][0]), "points of held bins")
+  return ERROR
+
+def test_select():
+  ERROR = 0
+  ERROR += check(select_lod(LOD_BINS, 640), 1024, "640 pixels")
+  ERROR += check(select_lod(LOD_BINS, 256), 256, "256 pixels")
+  ERROR += check(select_lod(LOD_BINS, 100), 256, "100 pixels")
+  ERROR += check(select_lod(LOD_BINS, 5000) is None, True, "5000 pixels")
+  return ERROR
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  sys.exit(test_binning() + test_partitions() + test_select())
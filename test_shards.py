@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import numpy as np
+import multiprocessing
+import os
+import sys
+import tempfile
+import analyze_euler
+import analyze_linear
+from euler import initial_state
+import shards
+from shards import shard_name, group_shards, find_shards, read_cells, needs_pool
+from watch_analysis import complete_shards
+from checks import check
+from profiling import enable_from_argv
+
+def write_rows(filename, state):
+  # same rows as writeCells
+  with open(filename, "w") as f:
+    for cell in range(state.shape[1]):
+      f.write(" ".join(["%.17g" % value for value in state[:, cell]]) + "\n")
+
+def write_shards(filename, state, num_colors):
+  # the cells of every color of an equal partition, like the writeCells index launch
+  for color, cells in enumerate(np.array_split(np.arange(state.shape[1]), num_colors)):
+    write_rows(shard_name(filename, color, num_colors), state[:, cells])
+
+def test_names():
+  ERROR = 0
+  ERROR += check(shard_name("linear.80.txt", 3, 7), "linear.80.3-of-7.txt", "shard name")
+  ERROR += check(group_shards(["euler.400.0-of-2.txt", "euler.400.1-of-2.txt", "linear.80.txt",
+                               "linear_amr.80.0.txt", "linear_ensemble.80.1.txt"]),
+                 ["euler.400.txt", "linear.80.txt", "linear_amr.80.0.txt",
+                  "linear_ensemble.80.1.txt"], "grouped outputs")
+  return ERROR
+
+def test_reassembly():
+  ERROR = 0
+  state = initial_state(400)
+  state[1] = np.linspace(-1.0, 1.0, 400)**3
+  with tempfile.TemporaryDirectory() as directory:
+    whole = os.path.join(directory, "whole", "euler.400.txt")
+    os.mkdir(os.path.dirname(whole))
+    write_rows(whole, state)
+    filename = os.path.join(directory, "euler.400.txt")
+    ERROR += check(find_shards(filename), None, "no shards")
+    write_shards(filename, state[:, :300], 3)
+    os.remove(shard_name(filename, 2, 3))
+    ERROR += check(find_shards(filename), None, "incomplete shards")
+    write_shards(filename, state, 7)
+    ERROR += check(len(find_shards(filename)), 7, "complete shards")
+    ERROR += check(read_cells(filename).T, state, "shards in color order")
+    ERROR += check(analyze_euler.measure_error(filename)[0],
+                   analyze_euler.measure_error(whole)[0], "euler L2 from shards")
+    phi = os.path.join(directory, "linear.80.txt")
+    write_shards(phi, state[:1, :80], 4)
+    ERROR += check(analyze_linear.measure_error(phi, np.float32)[2],
+                   state[0, :80].astype(np.float32), "linear cells from shards")
+    stable = {os.path.basename(path): (os.stat(path).st_size, os.stat(path).st_mtime_ns)
+              for path in find_shards(filename)[:6]}
+    ERROR += check(list(complete_shards(stable)), [], "watch waits for all shards")
+    stable[os.path.basename(shard_name(filename, 6, 7))] = (1, 1)
+    ERROR += check(list(complete_shards(stable)), ["euler.400.txt"], "watch sees whole output")
+  return ERROR
+
+def test_empty_and_pool():
+  ERROR = 0
+  state = initial_state(5)
+  with tempfile.TemporaryDirectory() as directory:
+    # more colors than cells leaves the last shards empty
+    filename = os.path.join(directory, "euler.5.txt")
+    write_shards(filename, state, 8)
+    ERROR += check(os.stat(shard_name(filename, 7, 8)).st_size, 0, "empty shard written")
+    ERROR += check(read_cells(filename).T, state, "empty shards skipped")
+    ERROR += check(needs_pool([filename]), False, "small shards read in process")
+    # the caller's pool reads shards once they hold PARALLEL_BYTES
+    parallel_bytes = shards.PARALLEL_BYTES
+    shards.PARALLEL_BYTES = 0
+    try:
+      ERROR += check(needs_pool([filename]), True, "pool for large shards")
+      whole = os.path.join(directory, "euler.4.txt")
+      write_shards(whole, initial_state(4), 1)
+      ERROR += check(needs_pool([whole]), False, "no pool for a single shard")
+      with multiprocessing.Pool(2) as pool:
+        ERROR += check(read_cells(filename, pool).T, state, "shards read by pool")
+    finally:
+      shards.PARALLEL_BYTES = parallel_bytes
+  return ERROR
+
+def main():
+  enable_from_argv()
+  ERROR = 0
+  ERROR += test_names()
+  ERROR += test_reassembly()
+  ERROR += test_empty_and_pool()
+  return ERROR
+
+if __name__== "__main__":
+  sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import os
+import sys
+import tempfile
+from summarize_prof import read_prof, summarize, utilization, compare
+from checks import check
+from profiling import enable_from_argv
+
+HEADER = "level\tstart\tend\tcolor\topacity\ttitle\tinitiation\tin\tout\tchildren\tparents\tprof_uid\n"
+
+def write_fixture(directory, procs):
+  os.makedirs(os.path.join(directory, "tsv"))
+  with open(os.path.join(directory, "tsv", "legion_prof_processor.tsv"), "w") as f:
+    f.write("full_text\ttext\ttsv\tlevels\n")
+    for proc in procs:
+      f.write("Node 0 CPU " + proc + "\tCPU " + proc + "\ttsv/Proc_" + proc + ".tsv\t1\n")
+  for proc, tasks in procs.items():
+    with open(os.path.join(directory, "tsv", "Proc_" + proc + ".tsv"), "w") as f:
+      f.write(HEADER)
+      for title, start, end in tasks:
+        f.write("1\t%f\t%f\t#ff0000\t1.0\t%s\t\t\t\t\t\t1\n" % (start, end, title))
+
+def test_summary():
+  ERROR = 0
+  with tempfile.TemporaryDirectory() as directory:
+    write_fixture(directory, {"1": [("calculateAMRFlux [(0)] <10>", 0.0, 10.0),
+                                    ("calculateAMRFlux [(1)] <11>", 10.0, 30.0),
+                                    ("copyToChildren <12>", 50.0, 55.0)],
+                              "2": [("calculateAMRFlux [(2)] <13>", 0.0, 30.0),
+                                    ("flagRegrid <14>", 20.0, 100.0)]})
+    records = read_prof(directory)
+    summary = summarize(records)
+    ERROR += check(summary["calculateAMRFlux"]["count"], 3, "calculateAMRFlux count")
+    ERROR += check(summary["calculateAMRFlux"]["total"], 60.0, "calculateAMRFlux total",
+                   rtol=1.0e-9)
+    ERROR += check(summary["calculateAMRFlux"]["mean"], 20.0, "calculateAMRFlux mean", rtol=1.0e-9)
+    ERROR += check(summary["calculateAMRFlux"]["p95"], 29.0, "calculateAMRFlux p95", rtol=1.0e-9)
+    ERROR += check(summary["copyToChildren"]["total"], 5.0, "copyToChildren total", rtol=1.0e-9)
+    busy = utilization(records)
+    ERROR += check(busy["Node 0 CPU 1"], 0.35, "CPU 1 utilization", rtol=1.0e-9)
+    # overlapping tasks on a processor only count once
+    ERROR += check(busy["Node 0 CPU 2"], 1.0, "CPU 2 utilization", rtol=1.0e-9)
+  return ERROR
+
+def test_compare():
+  ERROR = 0
+  old = {"applyFlux": {"count": 4, "total": 100.0, "mean": 25.0, "p95": 30.0},
+         "flagRegrid": {"count": 4, "total": 100.0, "mean": 25.0, "p95": 30.0}}
+  new = {"applyFlux": {"count": 4, "total": 105.0, "mean": 26.25, "p95": 30.0},
+         "flagRegrid": {"count": 4, "total": 200.0, "mean": 50.0, "p95": 60.0}}
+  regressions = compare(old, new, 0.1)
+  ERROR += check(len(regressions), 2, "regression count")
+  ERROR += check(len([entry for entry in regressions if entry[0] == "applyFlux"]), 0,
+                 "applyFlux within tolerance")
+  return ERROR
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  sys.exit(test_summary() + test_compare())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+import numpy as np
+import os
+import sys
+import tempfile
+from watch_analysis import current_run, poll, start_state, read_table, table_name
+from checks import check
+from profiling import enable_from_argv
+
+def write_level(directory, ncells, phi, mtime):
+  # one color's linear_amr file of a level, all cells active
+  filename = os.path.join(directory, "linear_amr.%d.0.txt" % ncells)
+  with open(filename, "w") as f:
+    for cell in range(ncells):
+      f.write("%f %.17g\n" % ((cell + 0.5) / ncells, phi((cell + 0.5) / ncells)))
+  os.utime(filename, ns=(mtime, mtime))
+
+def test_runs():
+  ERROR = 0
+  second = 10**9
+  ERROR += check(current_run({"a": 0, "b": second, "c": 100 * second, "d": 101 * second}),
+                 ["c", "d"], "newest run")
+  with tempfile.TemporaryDirectory() as directory:
+    # a 3 level run, then a 2 level run leaving the stale level 3 file behind
+    write_level(directory, 40, lambda x: 0.0, 1000 * second)
+    write_level(directory, 80, lambda x: 0.0, 1000 * second)
+    write_level(directory, 160, lambda x: 0.0, 1000 * second)
+    state = start_state(directory)
+    poll(directory, state)
+    poll(directory, state)
+    write_level(directory, 40, lambda x: float(x < 0.75), 2000 * second)
+    write_level(directory, 80, lambda x: float(x < 0.75), 2000 * second)
+    poll(directory, state)
+    poll(directory, state)
+    rows = read_table(table_name(directory, "linear_amr"))
+    ERROR += check(rows[0][0], 160.0, "first run NX")
+    ERROR += check((rows[-1][0], rows[-1][1]), (80.0, 0.0), "stale level left out")
+  return ERROR
+
+def main():
+  enable_from_argv()
+  ERROR = 0
+  ERROR += test_runs()
+  return ERROR
+
+if __name__== "__main__":
+  sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2018, Triad National Security, LLC
+# All rights reserved.
+# 
+# This program was produced under U.S. Government contract 89233218CNA000001 for
+# Los Alamos National Laboratory (LANL), which is operated by Triad National
+# Security, LLC for the U.S. Department of Energy/National Nuclear Security
+# Administration.
+# 
+# THIS SOFTWARE IS PROVIDED BY TRIAD NATIONAL SECURITY, LLC AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL TRIAD NATIONAL SECURITY, LLC OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# 
+# If software is modified to produce derivative works, such modified software should be
+# clearly marked, so as not to confuse it with the version available from LANL.
+#
+# analyze output files as a sweep writes them: each linear.*.txt, euler.*.txt and
+# linear_amr.*.*.txt is analyzed once, the L2 error is appended to convergence_<model>.dat
+# ("NX L2" rows, usable as plan_resolution.py --history) and the convergence plot is redrawn
+#
+import numpy as np
+import argparse
+import fnmatch
+import os
+import sys
+import time
+
+from plan_resolution import fit_order
+from shards import shard_info
+from profiling import enable_from_argv
+
+PATTERNS = {"linear": "linear.*.txt", "euler": "euler.*.txt", "linear_amr": "linear_amr.*.*.txt"}
+# seconds between the files of one run, see current_run
+RUN_GAP = 5.0
+
+def fingerprint(path):
+  stat = os.stat(path)
+  return stat.st_size, stat.st_mtime_ns
+
+def table_name(directory, model):
+  return os.path.join(directory, "convergence_" + model + ".dat")
+
+def read_table(filename):
+  # rows of (NX, L2, file, size, mtime_ns)
+  rows = []
+  if os.path.exists(filename):
+    with open(filename, "r") as f:
+      for line in f:
+        data = line.split("#")[0].split()
+        if len(data) == 5:
+          rows.append((float(data[0]), float(data[1]), data[2], int(data[3]), int(data[4])))
+  return rows
+
+def append_row(filename, row):
+  new_table = not os.path.exists(filename)
+  with open(filename, "a") as f:
+    if new_table:
+      f.write("# NX L2 file size mtime_ns\n")
+    f.write("%d %.17g %s %d %d\n" % row)
+
+def latest_by_resolution(rows):
+  # a rerun at the same NX replaces the earlier result
+  latest = {}
+  for row in rows:
+    latest[row[0]] = row[1]
+  NX = sorted(latest)
+  return NX, [latest[nx] for nx in NX]
+
+def model_of(filename):
+  for model in ["linear_amr", "linear", "euler"]:
+    if fnmatch.fnmatch(filename, PATTERNS[model]):
+      return model
+  return None
+
+def stable_files(directory, state):
+  # files whose fingerprint did not change since the last poll, so the writer is done with them
+  stable = {}
+  current = {}
+  for filename in sorted(os.listdir(directory)):
+    if model_of(filename) is None:
+      continue
+    try:
+      current[filename] = fingerprint(os.path.join(directory, filename))
+    except OSError:
+      continue
+    if state["last"].get(filename) == current[filename]:
+      stable[filename] = current[filename]
+  state["last"] = current
+  return stable
+
+def analyze_fixed(directory, model, filename):
+  if model == "linear":
+    from analyze_linear import measure_error
+  else:
+    from analyze_euler import measure_error
+  L2 = measure_error(os.path.join(directory, filename))[0]
+  return float(filename.split('.')[1]), L2
+
+def current_run(mtimes, run_gap=RUN_GAP):
+  # names of the linear_amr files of the newest run from their mtime_ns: a run writes all its
+  # files at the end within run_gap seconds, so files older than a larger gap are left over from
+  # an earlier run, e.g. deeper levels of a run with a higher MAX_REFINEMENT_LEVEL
+  names = sorted(mtimes, key=lambda filename: mtimes[filename])
+  start = 0
+  for i in range(1, len(names)):
+    if mtimes[names[i]] - mtimes[names[i - 1]] > run_gap * 1.0e9:
+      start = i
+  return names[start:]
+
+def analyze_amr(directory, state):
+  # L2 of the AMR solution in the linear_amr files of the newest run, each file parsed once
+  from analyze_linear import trapezoid
+  names = current_run({filename: entry[0][2] for filename, entry in state["amr"].items()},
+                      state.get("run_gap", RUN_GAP))
+  x = np.concatenate([state["amr"][filename][1] for filename in names])
+  phi = np.concatenate([state["amr"][filename][2] for filename in names])
+  order = np.argsort(x)
+  x = x[order]
+  phi = phi[order]
+  analytic = np.zeros(len(x))
+  analytic[np.where(x < 0.75)] = 1.0
+  NX = max([float(filename.split('.')[1]) for filename in names])
+  return NX, trapezoid(x, (phi - analytic)**2), names
+
+def ledger_name(directory):
+  return os.path.join(directory, ".watch_analysis")
+
+def complete_shards(stable):
+  # stable files as (keys, size, mtime), the shards of a fixed grid output replaced by one entry
+  # for the whole output once all its shards are stable
+  files = {}
+  sets = {}
+  for filename, (size, mtime) in stable.items():
+    info = shard_info(filename)
+    if info is None:
+      files[filename] = ([(filename, size, mtime)], size, mtime)
+    else:
+      sets.setdefault(info[:1] + info[2:], []).append((filename, size, mtime))
+  for (filename, colors), keys in sets.items():
+    if len(keys) == colors:
+      files[filename] = (keys, sum([key[1] for key in keys]), max([key[2] for key in keys]))
+  return files
+
+def poll(directory, state):
+  # analyze stable files not analyzed before, returns the models with new results
+  updated = set()
+  amr_changed = False
+  files = complete_shards(stable_files(directory, state))
+  for filename, (keys, size, mtime) in sorted(files.items()):
+    key = (filename, size, mtime)
+    if all([entry in state["seen"] for entry in keys]):
+      continue
+    state["seen"].update(keys)
+    with open(ledger_name(directory), "a") as f:
+      for entry in keys:
+        f.write("%s %d %d\n" % entry)
+    model = model_of(filename)
+    if model == "linear_amr":
+      from analyze_amr_linear import read_amr
+      x, phi = read_amr([os.path.join(directory, filename)])
+      state["amr"][filename] = (key, np.array(x), np.array(phi))
+      amr_changed = True
+      continue
+    NX, L2 = analyze_fixed(directory, model, filename)
+    append_row(table_name(directory, model), (NX, L2, filename, size, mtime))
+    print("%s NX=%d L2=%g" % (filename, NX, L2))
+    updated.add(model)
+  if amr_changed:
+    NX, L2, names = analyze_amr(directory, state)
+    size = sum([state["amr"][filename][0][1] for filename in names])
+    mtime = max([state["amr"][filename][0][2] for filename in names])
+    append_row(table_name(directory, "linear_amr"), (NX, L2, "linear_amr.*.*.txt", size, mtime))
+    print("linear_amr.*.*.txt NX=%d L2=%g" % (NX, L2))
+    updated.add("linear_amr")
+  return updated
+
+def report(directory, model, plot):
+  NX, L2 = latest_by_resolution(read_table(table_name(directory, model)))
+  p = None
+  if len(NX) > 1:
+    p, A = fit_order(NX, L2)
+    print("%s order %.3f from %d resolutions" % (model, p, len(NX)))
+  if plot:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
+    plt.title(model + " convergence")
+    plt.ylabel("L_2 error")
+    plt.xlabel("NX")
+    plt.yscale('log')
+    plt.xscale('log')
+    plt.plot(NX, L2, 'o')
+    if p is not None:
+      NX = np.array(NX)
+      plt.plot(NX, A * NX**-p, label="NX^-" + "%3.2f" % p)
+      plt.legend(loc='best')
+    plt.savefig(os.path.join(directory, "convergence_" + model + ".png"))
+    plt.close(fig)
+
+def start_state(directory):
+  # files in the ledger of an earlier watch are not analyzed again, unchanged AMR files are
+  # reloaded so new AMR files are measured together with them
+  state = {"seen": set(), "last": {}, "amr": {}}
+  if os.path.exists(ledger_name(directory)):
+    with open(ledger_name(directory), "r") as f:
+      for line in f:
+        filename, size, mtime = line.split()
+        state["seen"].add((filename, int(size), int(mtime)))
+  for filename, size, mtime in state["seen"]:
+    path = os.path.join(directory, filename)
+    if model_of(filename) == "linear_amr" and os.path.exists(path) \
+       and fingerprint(path) == (size, mtime):
+      from analyze_amr_linear import read_amr
+      x, phi = read_amr([path])
+      state["amr"][filename] = ((filename, size, mtime), np.array(x), np.array(phi))
+  return state
+
+if __name__== "__main__":
+  enable_from_argv()
+
+  parser = argparse.ArgumentParser(description='Analyze output files as they are written.')
+  parser.add_argument('directory',nargs='?',default='.')
+  parser.add_argument('--interval',type=float,default=5.0,help='seconds between polls')
+  parser.add_argument('--once',action='store_true',help='analyze what is finished and exit')
+  parser.add_argument('--no-plot',action='store_true',help='only update the results tables')
+  parser.add_argument('--run-gap',type=float,default=RUN_GAP,
+                      help='seconds between linear_amr files that starts a new run')
+  args = parser.parse_args()
+
+  state = start_state(args.directory)
+  state["run_gap"] = args.run_gap
+  polls = 0
+  while True:
+    for model in poll(args.directory, state):
+      report(args.directory, model, not args.no_plot)
+    polls += 1
+    # the first poll only records fingerprints, files unchanged at the second are finished
+    if args.once and polls == 2:
+      break
+    time.sleep(args.interval)